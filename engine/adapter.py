@@ -1,13 +1,16 @@
 """Audio generation adapter — sine waves now, real TTS later."""
 
 import math
-import struct
 from typing import List
 
+import numpy as np
+
 from .types import AudioChunk, VoiceInfo
 
 SAMPLE_RATE = 48000
 FRAME_SAMPLES = 960  # 20ms at 48kHz
+FRAME_BYTES = FRAME_SAMPLES * 2  # int16 mono
+BULK_FRAMES = 5  # frames per next_bulk() call (100ms)
 
 # Each "voice" is a different sine wave frequency
 VOICES: List[VoiceInfo] = [
@@ -22,17 +25,44 @@ VOICE_FREQ = {
     "sine-880": 880.0,
 }
 
+# Same data laid out column-wise for generating several voices at once
+VOICE_IDS: List[str] = list(VOICE_FREQ)
+VOICE_INDEX = {voice_id: i for i, voice_id in enumerate(VOICE_IDS)}
+FREQS = np.array([VOICE_FREQ[v] for v in VOICE_IDS], dtype=np.float64)
+PHASE_INCS = 2.0 * np.pi * FREQS / SAMPLE_RATE
+_FRAME_T = np.arange(FRAME_SAMPLES, dtype=np.float64)
+
 
 def list_voices() -> List[VoiceInfo]:
     """Return available voices."""
     return VOICES
 
 
+def _build_sine_table(frequency: float, amplitude: float) -> tuple[np.ndarray, int]:
+    """Tabulate a whole number of sine cycles as int16 PCM.
+
+    Returns (table, period) where period is the loop length in samples.
+    The table is extended by BULK_FRAMES frames past the period so any
+    frame or bulk read starting inside the loop is a contiguous slice.
+    """
+    if float(frequency).is_integer():
+        # An exact loop: e.g. 48000/gcd(48000, 220) = 2400 samples = 11 cycles
+        period = SAMPLE_RATE // math.gcd(SAMPLE_RATE, int(frequency))
+    else:
+        period = SAMPLE_RATE  # One second — best effort for fractional Hz
+    t = np.arange(period + FRAME_SAMPLES * BULK_FRAMES, dtype=np.float64)
+    values = amplitude * 32767 * np.sin(2.0 * math.pi * frequency * t / SAMPLE_RATE)
+    # Clamp to int16 range (only reachable when over-driven)
+    values = np.clip(values, -32768, 32767)
+    return values.astype("<i2"), period
+
+
 class SineWaveGenerator:
     """Generates continuous sine wave PCM audio chunks.
 
-    Maintains phase continuity across calls to next_chunk() so there
-    are no clicks or pops at frame boundaries.
+    Samples come from a per-voice lookup table covering an exact number
+    of cycles, so there is no sin() at runtime and phase stays continuous
+    across calls to next_chunk() — no clicks or pops at frame boundaries.
     """
 
     def __init__(self, voice_id: str, amplitude: float = 0.3):
@@ -40,25 +70,81 @@ class SineWaveGenerator:
             raise ValueError(f"Unknown voice: {voice_id}")
         self.frequency = VOICE_FREQ[voice_id]
         self.amplitude = amplitude
-        self.phase = 0.0
+        table, period = _build_sine_table(self.frequency, amplitude)
+        # Packed once: each frame is then a plain bytes slice, no per-frame packing
+        self._pcm = table.tobytes()
+        self._period_bytes = period * 2
+        self._offset = 0  # byte offset of the next frame within the loop
 
     def next_chunk(self) -> AudioChunk:
         """Generate the next 20ms frame of audio."""
-        phase_inc = 2.0 * math.pi * self.frequency / SAMPLE_RATE
-        samples = []
-        for _ in range(FRAME_SAMPLES):
-            value = self.amplitude * math.sin(self.phase)
-            # Clamp to int16 range and pack as little-endian signed 16-bit
-            samples.append(int(max(-32768, min(32767, value * 32767))))
-            self.phase += phase_inc
-
-        # Keep phase in [0, 2pi) to avoid floating point drift
-        self.phase %= 2.0 * math.pi
-
-        pcm = struct.pack(f"<{FRAME_SAMPLES}h", *samples)
+        start = self._offset
+        pcm = self._pcm[start:start + FRAME_BYTES]
+        self._offset = (start + FRAME_BYTES) % self._period_bytes
+        return AudioChunk(samples=pcm, sample_rate=SAMPLE_RATE, channels=1)
+
+    def next_bulk(self) -> AudioChunk:
+        """Generate the next BULK_FRAMES frames in one contiguous chunk."""
+        start = self._offset
+        size = FRAME_BYTES * BULK_FRAMES
+        pcm = self._pcm[start:start + size]
+        self._offset = (start + size) % self._period_bytes
         return AudioChunk(samples=pcm, sample_rate=SAMPLE_RATE, channels=1)
 
 
+class MultiSineGenerator:
+    """Generates 20ms frames for several sine voices in one vectorized call.
+
+    Phases for every voice live in a single array, so a frame for all
+    requested voices is one (num_voices, FRAME_SAMPLES) np.sin evaluation.
+    Each voice keeps its own phase continuity across calls.
+    """
+
+    def __init__(self, amplitude: float = 0.3):
+        self.amplitude = amplitude
+        self.phases = np.zeros(len(VOICE_IDS), dtype=np.float64)
+        # Scratch matrix reused every frame so generation allocates no temporaries
+        self._work = np.empty((len(VOICE_IDS), FRAME_SAMPLES), dtype=np.float64)
+
+    def _sine_rows(self, voice_ids: List[str]) -> np.ndarray:
+        """Unit-amplitude sine matrix (len(voice_ids), FRAME_SAMPLES); advances phases.
+
+        Returns a view of the scratch buffer, valid until the next call.
+        """
+        for voice_id in voice_ids:
+            if voice_id not in VOICE_INDEX:
+                raise ValueError(f"Unknown voice: {voice_id}")
+        rows = np.array([VOICE_INDEX[v] for v in voice_ids], dtype=np.intp)
+        incs = PHASE_INCS[rows]
+        values = self._work[:len(rows)]
+        np.multiply(_FRAME_T[None, :], incs[:, None], out=values)
+        values += self.phases[rows, None]
+        np.sin(values, out=values)
+        # Only the voices that were generated advance their phase
+        self.phases[rows] = (self.phases[rows] + FRAME_SAMPLES * incs) % (2.0 * np.pi)
+        return values
+
+    def next_frames(self, voice_ids: List[str]) -> dict[str, AudioChunk]:
+        """Generate the next 20ms frame for each of voice_ids."""
+        values = self._sine_rows(voice_ids)
+        values *= self.amplitude * 32767
+        if self.amplitude > 1.0:
+            np.clip(values, -32768, 32767, out=values)
+        pcm = values.astype("<i2")
+        return {
+            voice_id: AudioChunk(samples=pcm[i].tobytes(), sample_rate=SAMPLE_RATE, channels=1)
+            for i, voice_id in enumerate(voice_ids)
+        }
+
+    def next_mix(self, voice_ids: List[str]) -> AudioChunk:
+        """Generate one 20ms frame with voice_ids summed (scaled to avoid clipping)."""
+        values = self._sine_rows(voice_ids)
+        mixed = values.sum(axis=0) * (self.amplitude * 32767 / max(1, len(voice_ids)))
+        if self.amplitude > 1.0:
+            np.clip(mixed, -32768, 32767, out=mixed)
+        return AudioChunk(samples=mixed.astype("<i2").tobytes(), sample_rate=SAMPLE_RATE, channels=1)
+
+
 def create_generator(voice_id: str) -> SineWaveGenerator:
     """Factory to create an audio generator for the given voice."""
     return SineWaveGenerator(voice_id)
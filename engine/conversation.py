@@ -1,33 +1,104 @@
 """Conversation state — sliding window of turns + system prompt."""
 
+import asyncio
+import logging
 import os
 
+log = logging.getLogger("conversation")
+
 DEFAULT_SYSTEM_PROMPT = (
     "You are a helpful voice assistant. Keep responses concise — "
     "one to three sentences. Speak naturally as in a conversation."
 )
 
 SYSTEM_PROMPT = os.getenv("SYSTEM_PROMPT", "") or DEFAULT_SYSTEM_PROMPT
-MAX_TURNS = 10  # Keep last N turns (user + assistant pairs)
+MAX_TURNS = int(os.getenv("CONVERSATION_WINDOW", "6"))  # Recent turns kept verbatim by compact()
+SUMMARIZE_AFTER = 20  # Turns held before older ones are folded into a summary
 
 
 class ConversationHistory:
-    """Manages conversation turns for the LLM."""
+    """Manages conversation turns for the LLM.
+
+    The prompt is laid out for provider prompt caching: the base system
+    prompt never changes, and turns are only appended between compactions,
+    so each request's prefix is byte-identical to the previous one's.
+    Once more than SUMMARIZE_AFTER turns pile up, compact() folds all but
+    the last MAX_TURNS into a short summary appended after the base system
+    prompt, so prefill stays bounded however long the session runs.
+    """
 
     def __init__(self, system: str = ""):
-        self.system = system or SYSTEM_PROMPT
+        self._base_system = system or SYSTEM_PROMPT
+        self._summary = ""
         self._turns: list[dict] = []
+        self._messages: list[dict] | None = None  # Snapshot of _turns, reused until it changes
+        self._epoch = 0  # Bumped by clear() so an in-flight compaction can tell
+        self._compaction: asyncio.Task | None = None
+
+    @property
+    def system(self) -> str:
+        """Base system prompt, then the summary of compacted turns.
+
+        The summary goes last so the base prompt stays a stable cache prefix.
+        """
+        if not self._summary:
+            return self._base_system
+        return f"{self._base_system}\n\nEarlier in this conversation: {self._summary}"
 
     def add_turn(self, role: str, text: str):
-        """Add a turn to the history. Trims to MAX_TURNS."""
+        """Append a turn to the history."""
         self._turns.append({"role": role, "content": text})
-        if len(self._turns) > MAX_TURNS:
-            self._turns = self._turns[-MAX_TURNS:]
+        self._messages = None
 
     def get_messages(self) -> list[dict]:
-        """Return the message list for the LLM API."""
-        return list(self._turns)
+        """Return the message list for the LLM API.
+
+        The same list is returned until the history changes — treat it as
+        read-only (build new lists with `messages + extra`). A snapshot held
+        across add_turn() is unaffected.
+        """
+        if self._messages is None:
+            # Providers expect the first message to come from the user
+            turns = self._turns
+            start = next((i for i, t in enumerate(turns) if t["role"] == "user"), len(turns))
+            self._messages = turns[start:]
+        return self._messages
+
+    def maybe_compact(self, summarize):
+        """Start a background compact() if the history has outgrown SUMMARIZE_AFTER.
+
+        summarize: async callable(previous_summary, transcript) -> str.
+        """
+        if len(self._turns) <= SUMMARIZE_AFTER:
+            return
+        if self._compaction is not None and not self._compaction.done():
+            return
+        self._compaction = asyncio.ensure_future(self.compact(summarize))
+
+    async def compact(self, summarize):
+        """Fold all but the last MAX_TURNS turns into the running summary."""
+        old = self._turns[:-MAX_TURNS]
+        if not old:
+            return
+        epoch = self._epoch
+        transcript = "\n".join(f"{t['role']}: {t['content']}" for t in old)
+        try:
+            summary = (await summarize(self._summary, transcript)).strip()
+        except Exception as e:
+            # Still drop the old turns; they're outside the window anyway
+            log.warning("Conversation summary failed: %s", e)
+            summary = self._summary
+        if epoch != self._epoch:
+            return  # clear() ran while we were summarizing
+        # Only appends happen meanwhile, so `old` is still the prefix
+        del self._turns[:len(old)]
+        self._summary = summary
+        self._messages = None
+        log.info("Compacted %d turns into summary (%d chars)", len(old), len(summary))
 
     def clear(self):
         """Reset conversation history."""
         self._turns.clear()
+        self._summary = ""
+        self._messages = None
+        self._epoch += 1
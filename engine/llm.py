@@ -2,9 +2,12 @@
 
 import asyncio
 import functools
+import hashlib
 import json
 import logging
 import os
+import time
+from collections import OrderedDict
 
 log = logging.getLogger("llm")
 
@@ -15,6 +18,10 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwen2.5:14b")
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+LLM_CACHE = os.getenv("LLM_CACHE", "") == "1"  # Reuse replies for identical prompts
+LLM_CACHE_SIZE = 512
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "600"))  # seconds a cached reply stays valid
+MODEL_CATALOG_TTL = 30.0  # seconds a get_available_models() result is reused
 
 # Curated Ollama models — fast, conversational, good for voice agent
 # Sorted by parameter count ascending for consistent display
@@ -34,15 +41,34 @@ OLLAMA_CATALOG = [
     {"name": "deepseek-r1:14b", "label": "DeepSeek R1", "params": "14B", "params_num": 14.0},
 ]
 
+# Catalog lookup by both "mistral" and "mistral:latest" forms
+_CATALOG_BY_NAME = (
+    {m["name"]: m for m in OLLAMA_CATALOG}
+    | {m["name"] + ":latest": m for m in OLLAMA_CATALOG}
+)
+
+# Per-entry payload for the "available to download" list (shared, read-only)
+_CATALOG_SUMMARIES = [
+    {"name": m["name"], "label": m["label"], "params": m["params"]}
+    for m in OLLAMA_CATALOG
+]
+
+# Cloud providers are fixed by env at import time (shared, read-only)
+_CLOUD_PROVIDERS = []
+if ANTHROPIC_API_KEY:
+    _CLOUD_PROVIDERS.append({"provider": "claude", "name": "Claude Haiku", "model": "claude-haiku-4-5-20251001"})
+if OPENAI_API_KEY:
+    _CLOUD_PROVIDERS.append({"provider": "openai", "name": f"OpenAI ({OPENAI_MODEL})", "model": OPENAI_MODEL})
+
 # Lazy-loaded clients
 _anthropic_client = None
 _openai_client = None
-_httpx_client = None
 _async_httpx_client = None
 
 
+@functools.lru_cache(maxsize=1)
 def _resolve_provider() -> str:
-    """Determine which LLM provider to use."""
+    """Determine which LLM provider to use (env-derived, so cached)."""
     if LLM_PROVIDER in ("claude", "openai", "ollama"):
         return LLM_PROVIDER
     # Auto-detect: Claude > OpenAI > Ollama
@@ -57,7 +83,7 @@ def _get_anthropic():
     global _anthropic_client
     if _anthropic_client is None:
         import anthropic
-        _anthropic_client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+        _anthropic_client = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
         log.info("Anthropic client initialized")
     return _anthropic_client
 
@@ -65,30 +91,53 @@ def _get_anthropic():
 def _get_openai():
     global _openai_client
     if _openai_client is None:
-        from openai import OpenAI
-        _openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        from openai import AsyncOpenAI
+        _openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
         log.info("OpenAI client initialized")
     return _openai_client
 
 
-def _get_httpx():
-    global _httpx_client
-    if _httpx_client is None:
-        import httpx
-        _httpx_client = httpx.Client(timeout=30.0)
-        log.info("httpx client initialized for Ollama at %s", OLLAMA_URL)
-    return _httpx_client
+def _ollama_client_kwargs() -> dict:
+    """Pool/timeout settings for the shared Ollama client.
+
+    Ollama is a single (usually local) host hit with back-to-back turns,
+    so keep connections warm and skip env proxy lookups.
+    """
+    import httpx
+    return {
+        "timeout": httpx.Timeout(connect=5.0, read=120.0, write=30.0, pool=30.0),
+        "limits": httpx.Limits(
+            max_connections=64,
+            max_keepalive_connections=32,
+            keepalive_expiry=300.0,
+        ),
+        "trust_env": False,
+    }
 
 
 def _get_async_httpx():
     global _async_httpx_client
     if _async_httpx_client is None:
         import httpx
-        _async_httpx_client = httpx.AsyncClient(timeout=30.0)
+        _async_httpx_client = httpx.AsyncClient(**_ollama_client_kwargs())
         log.info("async httpx client initialized for Ollama at %s", OLLAMA_URL)
     return _async_httpx_client
 
 
+async def close():
+    """Close the shared LLM clients (call on server shutdown)."""
+    global _anthropic_client, _openai_client, _async_httpx_client
+    if _async_httpx_client is not None:
+        await _async_httpx_client.aclose()
+        _async_httpx_client = None
+    if _anthropic_client is not None:
+        await _anthropic_client.close()
+        _anthropic_client = None
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+
 def _format_size(size_bytes: int) -> str:
     """Format bytes into human-readable size (e.g., '1.9GB')."""
     if size_bytes >= 1e9:
@@ -100,8 +149,12 @@ def _format_size(size_bytes: int) -> str:
 
 # ── Ollama discovery ──────────────────────────────────────────
 
-async def list_ollama_models() -> list[dict]:
-    """Query Ollama API for installed models. Returns [] if Ollama is offline."""
+async def _list_ollama_models_with_status() -> tuple[list[dict], bool]:
+    """Query Ollama for installed models in one request.
+
+    Returns (models, online): online is True whenever Ollama answered,
+    even if it has no models installed.
+    """
     try:
         client = _get_async_httpx()
         resp = await client.get(f"{OLLAMA_URL}/api/tags")
@@ -114,21 +167,41 @@ async def list_ollama_models() -> list[dict]:
                 "size_label": _format_size(m.get("size", 0)),
             }
             for m in models
-        ]
+        ], True
     except Exception as e:
         log.warning("Ollama not reachable: %s", e)
-        return []
+        return [], False
 
 
-async def get_available_models() -> dict:
-    """Build full model catalog: installed Ollama + downloadable + cloud providers."""
-    installed = await list_ollama_models()
+async def list_ollama_models() -> list[dict]:
+    """Query Ollama API for installed models. Returns [] if Ollama is offline."""
+    models, _online = await _list_ollama_models_with_status()
+    return models
+
+
+# get_available_models() memo: (monotonic timestamp, catalog), plus the
+# in-flight build so concurrent callers share one Ollama request
+_models_cache: tuple[float, dict] | None = None
+_models_task: asyncio.Task | None = None
+
 
-    # Build lookup from catalog (both "mistral" and "mistral:latest" forms)
-    catalog_by_name = {}
-    for m in OLLAMA_CATALOG:
-        catalog_by_name[m["name"]] = m
-        catalog_by_name[m["name"] + ":latest"] = m
+async def get_available_models(fresh: bool = False) -> dict:
+    """Return the model catalog, reusing a result younger than MODEL_CATALOG_TTL.
+
+    Pass fresh=True after installing a model. The returned dict is shared.
+    """
+    global _models_task
+    if not fresh and _models_cache and time.monotonic() - _models_cache[0] < MODEL_CATALOG_TTL:
+        return _models_cache[1]
+    if fresh or _models_task is None or _models_task.done():
+        _models_task = asyncio.ensure_future(_build_model_catalog())
+    return await asyncio.shield(_models_task)
+
+
+async def _build_model_catalog() -> dict:
+    """Build full model catalog: installed Ollama + downloadable + cloud providers."""
+    global _models_cache
+    installed, ollama_online = await _list_ollama_models_with_status()
 
     # Normalize names: Ollama reports "mistral:latest" but catalog uses "mistral"
     installed_names = set()
@@ -137,7 +210,7 @@ async def get_available_models() -> dict:
         if m["name"].endswith(":latest"):
             installed_names.add(m["name"][:-7])
         # Enrich with param info from catalog
-        cat = catalog_by_name.get(m["name"])
+        cat = _CATALOG_BY_NAME.get(m["name"])
         if cat:
             m["params"] = cat["params"]
             m["params_num"] = cat["params_num"]
@@ -146,37 +219,17 @@ async def get_available_models() -> dict:
     # Sort installed by file size (ascending = smallest first)
     installed.sort(key=lambda m: m.get("size", 0))
 
-    ollama_online = len(installed) > 0 or False
-
-    # If Ollama responded but has no models, it's still online
-    if not ollama_online:
-        try:
-            client = _get_async_httpx()
-            resp = await client.get(f"{OLLAMA_URL}/api/tags")
-            ollama_online = resp.status_code == 200
-        except Exception:
-            ollama_online = False
-
     # Curated models not yet installed (already sorted by params_num in OLLAMA_CATALOG)
-    available = [
-        {"name": m["name"], "label": m["label"], "params": m["params"]}
-        for m in OLLAMA_CATALOG
-        if m["name"] not in installed_names
-    ]
-
-    # Cloud providers
-    cloud = []
-    if ANTHROPIC_API_KEY:
-        cloud.append({"provider": "claude", "name": "Claude Haiku", "model": "claude-haiku-4-5-20251001"})
-    if OPENAI_API_KEY:
-        cloud.append({"provider": "openai", "name": f"OpenAI ({OPENAI_MODEL})", "model": OPENAI_MODEL})
+    available = [m for m in _CATALOG_SUMMARIES if m["name"] not in installed_names]
 
-    return {
+    catalog = {
         "ollama_installed": installed,
         "ollama_available": available,
         "ollama_online": ollama_online,
-        "cloud_providers": cloud,
+        "cloud_providers": _CLOUD_PROVIDERS,
     }
+    _models_cache = (time.monotonic(), catalog)
+    return catalog
 
 
 async def pull_ollama_model(name: str):
@@ -199,27 +252,97 @@ async def pull_ollama_model(name: str):
                     continue
 
 
+# ── Reply cache ───────────────────────────────────────────────
+
+# LRU with expiry: sha1(provider, model, system, messages) → (expires_at, reply text)
+_reply_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+
+def _reply_cache_key(provider: str, model: str, system: str, messages: list[dict],
+                     tools: list[dict] | None = None) -> str:
+    payload = json.dumps([provider, model, system, messages, tools],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _reply_cache_get(key: str) -> str | None:
+    entry = _reply_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, reply = entry
+    if time.monotonic() >= expires_at:
+        del _reply_cache[key]  # Stale — time-sensitive answers shouldn't outlive LLM_CACHE_TTL
+        return None
+    _reply_cache.move_to_end(key)
+    return reply
+
+
+def _reply_cache_put(key: str, reply: str):
+    _reply_cache[key] = (time.monotonic() + LLM_CACHE_TTL, reply)
+    _reply_cache.move_to_end(key)
+    if len(_reply_cache) > LLM_CACHE_SIZE:
+        _reply_cache.popitem(last=False)
+
+
 # ── Generation ────────────────────────────────────────────────
 
-def _generate_claude(system: str, messages: list[dict]) -> str:
-    """Call Claude Haiku via the Anthropic SDK (synchronous)."""
+@functools.lru_cache(maxsize=32)
+def _system_message(system: str) -> dict:
+    """Shared {"role": "system"} message for a prompt (the prompt rarely changes).
+
+    The dict is reused across calls — never mutate it.
+    """
+    return {"role": "system", "content": system}
+
+
+# Anthropic prompt caching: the prefix up to a cache_control breakpoint is
+# reused if byte-identical. Prompts under the model's minimum cacheable
+# length are simply not cached, so marking them is harmless.
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+@functools.lru_cache(maxsize=32)
+def _claude_system(system: str) -> tuple:
+    """System prompt as a cached text block (a stable prefix for every turn)."""
+    return ({"type": "text", "text": system, "cache_control": _EPHEMERAL},)
+
+
+def _claude_messages(messages: list[dict]) -> list[dict]:
+    """Copy of messages with a cache breakpoint on the last one.
+
+    The next turn only appends, so everything up to here is a cache hit
+    then. The caller's dicts are left untouched.
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content, "cache_control": _EPHEMERAL}]
+    else:
+        blocks = [*content[:-1], {**content[-1], "cache_control": _EPHEMERAL}]
+    return [*messages[:-1], {**last, "content": blocks}]
+
+
+async def _generate_claude(system: str, messages: list[dict]) -> str:
+    """Call Claude Haiku via the async Anthropic SDK."""
     client = _get_anthropic()
-    resp = client.messages.create(
+    resp = await client.messages.create(
         model="claude-haiku-4-5-20251001",
         max_tokens=300,
-        system=system,
-        messages=messages,
+        system=list(_claude_system(system)),
+        messages=_claude_messages(messages),
     )
     text = resp.content[0].text
     log.info("Claude response: %d chars, stop=%s", len(text), resp.stop_reason)
     return text
 
 
-def _generate_openai(system: str, messages: list[dict]) -> str:
-    """Call OpenAI via the OpenAI SDK (synchronous)."""
+async def _generate_openai(system: str, messages: list[dict]) -> str:
+    """Call OpenAI via the async OpenAI SDK."""
     client = _get_openai()
-    openai_messages = [{"role": "system", "content": system}] + messages
-    resp = client.chat.completions.create(
+    openai_messages = [_system_message(system), *messages]
+    resp = await client.chat.completions.create(
         model=OPENAI_MODEL,
         max_tokens=300,
         messages=openai_messages,
@@ -229,12 +352,12 @@ def _generate_openai(system: str, messages: list[dict]) -> str:
     return text
 
 
-def _generate_ollama(system: str, messages: list[dict], model: str = "") -> str:
-    """Call Ollama local model via HTTP (synchronous)."""
-    client = _get_httpx()
+async def _generate_ollama(system: str, messages: list[dict], model: str = "") -> str:
+    """Call Ollama local model via HTTP (async, on the shared client)."""
+    client = _get_async_httpx()
     active_model = model or OLLAMA_MODEL
-    ollama_messages = [{"role": "system", "content": system}] + messages
-    resp = client.post(
+    ollama_messages = [_system_message(system), *messages]
+    resp = await client.post(
         f"{OLLAMA_URL}/api/chat",
         json={"model": active_model, "messages": ollama_messages, "stream": False},
     )
@@ -244,20 +367,8 @@ def _generate_ollama(system: str, messages: list[dict], model: str = "") -> str:
     return text
 
 
-def _generate_sync(system: str, messages: list[dict], provider: str = "", model: str = "") -> str:
-    """Synchronous generate — dispatches to the given or default provider."""
-    provider = provider or _resolve_provider()
-    log.info("LLM generate: provider=%s, model=%s, %d messages", provider, model, len(messages))
-    if provider == "claude":
-        return _generate_claude(system, messages)
-    elif provider == "openai":
-        return _generate_openai(system, messages)
-    else:
-        return _generate_ollama(system, messages, model=model)
-
-
 async def generate(system: str, messages: list[dict], provider: str = "", model: str = "") -> str:
-    """Generate an LLM response (runs in thread pool).
+    """Generate an LLM response (all providers use native async clients).
 
     Args:
         system: System prompt string.
@@ -268,14 +379,126 @@ async def generate(system: str, messages: list[dict], provider: str = "", model:
     Returns:
         The assistant's reply text.
     """
-    loop = asyncio.get_event_loop()
-    fn = functools.partial(_generate_sync, system, messages, provider, model)
-    return await loop.run_in_executor(None, fn)
+    provider = provider or _resolve_provider()
+    log.info("LLM generate: provider=%s, model=%s, %d messages", provider, model, len(messages))
+
+    key = None
+    if LLM_CACHE:
+        key = _reply_cache_key(provider, model or OLLAMA_MODEL, system, messages)
+        cached = _reply_cache_get(key)
+        if cached is not None:
+            log.info("LLM cache hit (%d chars)", len(cached))
+            return cached
+
+    if provider == "claude":
+        text = await _generate_claude(system, messages)
+    elif provider == "openai":
+        text = await _generate_openai(system, messages)
+    else:
+        text = await _generate_ollama(system, messages, model=model)
+
+    if key is not None and text:
+        _reply_cache_put(key, text)
+    return text
+
+
+# ── Streaming generation ─────────────────────────────────────
+
+async def _stream_claude(system: str, messages: list[dict]):
+    """Stream Claude Haiku text deltas."""
+    client = _get_anthropic()
+    async with client.messages.stream(
+        model="claude-haiku-4-5-20251001",
+        max_tokens=300,
+        system=list(_claude_system(system)),
+        messages=_claude_messages(messages),
+    ) as stream:
+        async for delta in stream.text_stream:
+            yield delta
+
+
+async def _stream_openai(system: str, messages: list[dict]):
+    """Stream OpenAI text deltas."""
+    client = _get_openai()
+    stream = await client.chat.completions.create(
+        model=OPENAI_MODEL,
+        max_tokens=300,
+        messages=[_system_message(system), *messages],
+        stream=True,
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def _stream_ollama(system: str, messages: list[dict], model: str = ""):
+    """Stream Ollama text deltas (newline-delimited JSON from /api/chat)."""
+    client = _get_async_httpx()
+    active_model = model or OLLAMA_MODEL
+    async with client.stream(
+        "POST",
+        f"{OLLAMA_URL}/api/chat",
+        json={
+            "model": active_model,
+            "messages": [_system_message(system), *messages],
+            "stream": True,
+        },
+    ) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            delta = data.get("message", {}).get("content", "")
+            if delta:
+                yield delta
+            if data.get("done"):
+                break
+
+
+async def generate_stream(system: str, messages: list[dict], provider: str = "", model: str = ""):
+    """Generate an LLM response as an async iterator of text deltas.
+
+    Same arguments as generate(). Lets callers start TTS on the first
+    sentence while the rest of the reply is still being generated. A
+    cached reply is yielded as a single delta.
+    """
+    provider = provider or _resolve_provider()
+    log.info("LLM generate_stream: provider=%s, model=%s, %d messages",
+             provider, model, len(messages))
+
+    key = None
+    if LLM_CACHE:
+        key = _reply_cache_key(provider, model or OLLAMA_MODEL, system, messages)
+        cached = _reply_cache_get(key)
+        if cached is not None:
+            log.info("LLM cache hit (%d chars)", len(cached))
+            yield cached
+            return
+
+    if provider == "claude":
+        stream = _stream_claude(system, messages)
+    elif provider == "openai":
+        stream = _stream_openai(system, messages)
+    else:
+        stream = _stream_ollama(system, messages, model=model)
+    parts = []
+    try:
+        async for delta in stream:
+            parts.append(delta)
+            yield delta
+    finally:
+        await stream.aclose()  # Caller may stop early (barge-in)
+
+    # Only reached when the stream ran to completion
+    text = "".join(parts)
+    if key is not None and text:
+        _reply_cache_put(key, text)
 
 
 # ── Tool-calling generation ──────────────────────────────────
 
-def _generate_claude_with_tools(system: str, messages: list[dict], tools: list[dict]) -> tuple:
+async def _generate_claude_with_tools(system: str, messages: list[dict], tools: list[dict]) -> tuple:
     """Call Claude with tool-use support. Returns (text, tool_calls)."""
     client = _get_anthropic()
     anthropic_tools = [
@@ -286,11 +509,11 @@ def _generate_claude_with_tools(system: str, messages: list[dict], tools: list[d
         }
         for t in tools
     ]
-    resp = client.messages.create(
+    resp = await client.messages.create(
         model="claude-haiku-4-5-20251001",
         max_tokens=300,
-        system=system,
-        messages=messages,
+        system=list(_claude_system(system)),
+        messages=_claude_messages(messages),
         tools=anthropic_tools,
     )
     text = ""
@@ -308,11 +531,11 @@ def _generate_claude_with_tools(system: str, messages: list[dict], tools: list[d
     return text, tool_calls
 
 
-def _generate_openai_with_tools(system: str, messages: list[dict], tools: list[dict]) -> tuple:
+async def _generate_openai_with_tools(system: str, messages: list[dict], tools: list[dict]) -> tuple:
     """Call OpenAI with tool-use support. Returns (text, tool_calls)."""
     client = _get_openai()
-    openai_messages = [{"role": "system", "content": system}] + messages
-    resp = client.chat.completions.create(
+    openai_messages = [_system_message(system), *messages]
+    resp = await client.chat.completions.create(
         model=OPENAI_MODEL,
         max_tokens=300,
         messages=openai_messages,
@@ -335,16 +558,16 @@ def _generate_openai_with_tools(system: str, messages: list[dict], tools: list[d
     return text, tool_calls
 
 
-def _generate_ollama_with_tools(system: str, messages: list[dict],
-                                tools: list[dict], model: str = "") -> tuple:
+async def _generate_ollama_with_tools(system: str, messages: list[dict],
+                                      tools: list[dict], model: str = "") -> tuple:
     """Call Ollama with tool-use support. Returns (text, tool_calls)."""
-    client = _get_httpx()
+    client = _get_async_httpx()
     active_model = model or OLLAMA_MODEL
-    ollama_messages = [{"role": "system", "content": system}] + messages
+    ollama_messages = [_system_message(system), *messages]
     body = {"model": active_model, "messages": ollama_messages, "stream": False}
     if tools:
         body["tools"] = tools
-    resp = client.post(f"{OLLAMA_URL}/api/chat", json=body)
+    resp = await client.post(f"{OLLAMA_URL}/api/chat", json=body)
     resp.raise_for_status()
     msg = resp.json()["message"]
     text = msg.get("content", "")
@@ -359,35 +582,38 @@ def _generate_ollama_with_tools(system: str, messages: list[dict],
     return text, tool_calls
 
 
-def _generate_with_tools_sync(system: str, messages: list[dict],
+async def generate_with_tools(system: str, messages: list[dict],
                                tools: list[dict], provider: str = "",
                                model: str = "") -> tuple:
-    """Synchronous generate with tools — dispatches to provider."""
+    """Generate with tool-calling support (native async clients).
+
+    Returns:
+        (text, tool_calls) where tool_calls is a list of:
+        [{"id": str (optional), "function": {"name": str, "arguments": dict}}]
+    """
     provider = provider or _resolve_provider()
     log.info("LLM generate_with_tools: provider=%s, model=%s, %d tools",
              provider, model, len(tools))
+
+    key = None
+    if LLM_CACHE:
+        key = _reply_cache_key(provider, model or OLLAMA_MODEL, system, messages, tools)
+        cached = _reply_cache_get(key)
+        if cached is not None:
+            log.info("LLM cache hit (%d chars)", len(cached))
+            return cached, []
+
     if provider == "claude":
-        return _generate_claude_with_tools(system, messages, tools)
+        text, tool_calls = await _generate_claude_with_tools(system, messages, tools)
     elif provider == "openai":
-        return _generate_openai_with_tools(system, messages, tools)
+        text, tool_calls = await _generate_openai_with_tools(system, messages, tools)
     else:
-        return _generate_ollama_with_tools(system, messages, tools, model=model)
-
+        text, tool_calls = await _generate_ollama_with_tools(system, messages, tools, model=model)
 
-async def generate_with_tools(system: str, messages: list[dict],
-                               tools: list[dict], provider: str = "",
-                               model: str = "") -> tuple:
-    """Generate with tool-calling support (runs in thread pool).
-
-    Returns:
-        (text, tool_calls) where tool_calls is a list of:
-        [{"id": str (optional), "function": {"name": str, "arguments": dict}}]
-    """
-    loop = asyncio.get_event_loop()
-    fn = functools.partial(
-        _generate_with_tools_sync, system, messages, tools, provider, model
-    )
-    return await loop.run_in_executor(None, fn)
+    # Tool calls trigger fresh searches — only plain answers are reusable
+    if key is not None and text and not tool_calls:
+        _reply_cache_put(key, text)
+    return text, tool_calls
 
 
 def build_tool_result_messages(provider: str, tool_calls: list[dict],
@@ -472,8 +698,13 @@ def build_tool_result_messages(provider: str, tool_calls: list[dict],
     return messages
 
 
+@functools.lru_cache(maxsize=1)
 def available_providers() -> list[dict]:
-    """Return list of available providers with their config status."""
+    """Return list of available providers with their config status.
+
+    Depends only on env config, so it is computed once. Callers must
+    treat the returned list as read-only.
+    """
     providers = []
     if ANTHROPIC_API_KEY:
         providers.append({"id": "claude", "name": "Claude Haiku"})
@@ -0,0 +1,68 @@
+"""Streaming polyphase resampling for chunked audio (TTS output, mic input)."""
+
+import numpy as np
+from scipy.signal import firwin, upfirdn
+
+
+class StreamResampler:
+    """Stateful polyphase resampler for chunked input.
+
+    Uses the same Kaiser-windowed FIR and delay compensation as
+    scipy.signal.resample_poly, so concatenating the output of feed()
+    calls plus flush() matches a one-shot resample_poly of the whole
+    signal — without holding the whole utterance in memory.
+    """
+
+    def __init__(self, up: int, down: int):
+        self.up = up
+        self.down = down
+        max_rate = max(up, down)
+        half_len = 10 * max_rate
+        h = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+        # Pre-pad so the filter's group delay is a whole number of outputs
+        n_pre_pad = down - half_len % down
+        self._h = np.concatenate((np.zeros(n_pre_pad), h)).astype(np.float32)
+        self._skip_total = (half_len + n_pre_pad) // down  # filter-delay outputs
+        self._skip = self._skip_total  # how many of those are still to drop
+        self._buf = np.zeros(0, dtype=np.float32)  # recent input history
+        self._buf_start = 0  # absolute input index of _buf[0] (multiple of down)
+        self._in_total = 0   # input samples fed so far
+        self._out_next = 0   # absolute index of the next output to compute
+
+    def _run(self, end: int) -> np.ndarray:
+        """Compute outputs [_out_next, end) from the buffered history."""
+        if end <= self._out_next:
+            return np.zeros(0, dtype=np.float32)
+        y = upfirdn(self._h, self._buf, self.up, self.down)
+        local = self._out_next - self._buf_start * self.up // self.down
+        out = y[local:local + end - self._out_next]
+        self._out_next = end
+
+        # Keep only the input the next output still reaches back to
+        oldest = max(0, (self._out_next * self.down - len(self._h) + 1) // self.up)
+        new_start = oldest - oldest % self.down
+        if new_start > self._buf_start:
+            self._buf = self._buf[new_start - self._buf_start:]
+            self._buf_start = new_start
+
+        # Drop the filter-delay outputs at the very start of the stream
+        if self._skip:
+            dropped = min(self._skip, len(out))
+            out = out[dropped:]
+            self._skip -= dropped
+        return out
+
+    def feed(self, samples: np.ndarray) -> np.ndarray:
+        """Push input samples; return every output that is now final."""
+        self._buf = np.concatenate((self._buf, samples.astype(np.float32)))
+        self._in_total += len(samples)
+        # Output k only needs input up to floor(k * down / up)
+        return self._run((self._in_total - 1) * self.up // self.down + 1)
+
+    def flush(self) -> np.ndarray:
+        """Zero-pad the tail and return the remaining outputs."""
+        n_out = -(-self._in_total * self.up // self.down)  # ceil, like resample_poly
+        end = n_out + self._skip_total
+        pad = len(self._h) // self.up + self.down + 1
+        self._buf = np.concatenate((self._buf, np.zeros(pad, dtype=np.float32)))
+        return self._run(end)
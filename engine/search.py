@@ -152,7 +152,7 @@ async def _search_duckduckgo(query: str) -> dict | None:
             log.warning("DuckDuckGo search failed: %s", e)
             return []
 
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     results = await loop.run_in_executor(None, _sync_search)
     if results:
         log.info("DuckDuckGo: %d results for %r", len(results), query[:60])
@@ -1,9 +1,10 @@
 """Faster-Whisper STT wrapper — audio bytes to text."""
 
 import logging
+import math
 
 import numpy as np
-from scipy.signal import resample
+from scipy.signal import resample_poly
 
 log = logging.getLogger("stt")
 
@@ -27,41 +28,70 @@ def _get_model():
     return _model
 
 
-def transcribe(audio_bytes: bytes, sample_rate: int = 48000) -> str:
-    """Transcribe PCM int16 audio bytes to text.
+def warmup():
+    """Load the Whisper model and run a short silent clip through it."""
+    model = _get_model()
+    segments, _ = model.transcribe(np.zeros(1600, dtype=np.float32), beam_size=5, language="en")
+    list(segments)  # segments are lazy — force decoding
+
+
+def _as_int16(audio) -> np.ndarray:
+    """View PCM bytes as int16 samples; int16 arrays pass through uncopied."""
+    if isinstance(audio, np.ndarray):
+        return audio
+    return np.frombuffer(audio, dtype=np.int16)
+
+
+def transcribe_segments(audio, sample_rate: int = 48000) -> list[tuple[float, float, str]]:
+    """Transcribe PCM int16 audio into timed segments.
 
     Args:
-        audio_bytes: Raw PCM int16 mono audio bytes.
+        audio: Raw PCM int16 mono audio bytes, or an int16 ndarray of samples
+               (e.g. a slice of the mic buffer — read, never copied or kept).
         sample_rate: Sample rate of the audio (default 48kHz from WebRTC).
 
     Returns:
-        Transcribed text string, or empty string if nothing detected.
+        (start, end, text) per segment, times in seconds from the start of
+        the audio. Empty list if nothing detected.
     """
-    if not audio_bytes:
-        return ""
+    raw = _as_int16(audio)
+    if not len(raw):
+        return []
 
     model = _get_model()
 
-    # Convert int16 PCM to float32 normalized [-1.0, 1.0] — what faster-whisper expects
-    samples = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+    duration = len(raw) / sample_rate
+    log.debug("Transcribing %.2fs of audio (%d samples @ %dHz)", duration, len(raw), sample_rate)
 
-    duration = len(samples) / sample_rate
-    log.debug("Transcribing %.2fs of audio (%d samples @ %dHz)", duration, len(samples), sample_rate)
-
-    # Resample to 16kHz — faster-whisper expects 16kHz input
+    # Resample to 16kHz — faster-whisper expects 16kHz input (48k -> 16k is 1/3).
+    # Cast to float32 first: resample_poly matches its filter to float input,
+    # so the whole decimation stays float32 (int16 input would run in float64).
     WHISPER_RATE = 16000
+    samples = raw.astype(np.float32)
     if sample_rate != WHISPER_RATE:
-        num_output = int(len(samples) * WHISPER_RATE / sample_rate)
-        samples = resample(samples, num_output).astype(np.float32)
+        g = math.gcd(WHISPER_RATE, sample_rate)
+        samples = resample_poly(samples, WHISPER_RATE // g, sample_rate // g)
         log.debug("Resampled to %d samples @ %dHz", len(samples), WHISPER_RATE)
 
+    # Normalize to [-1.0, 1.0] in place on the (3x shorter) output
+    samples *= 1.0 / 32768.0
+
     segments, info = model.transcribe(samples, beam_size=5, language="en")
+    return [(seg.start, seg.end, seg.text.strip()) for seg in segments]
 
-    # Collect all segment texts
-    text_parts = []
-    for segment in segments:
-        text_parts.append(segment.text.strip())
 
-    result = " ".join(text_parts).strip()
-    log.info("Transcription: %r", result[:100])
+def transcribe(audio, sample_rate: int = 48000) -> str:
+    """Transcribe PCM int16 audio to text.
+
+    Args:
+        audio: Raw PCM int16 mono audio bytes, or an int16 ndarray of samples.
+        sample_rate: Sample rate of the audio (default 48kHz from WebRTC).
+
+    Returns:
+        Transcribed text string, or empty string if nothing detected.
+    """
+    segments = transcribe_segments(audio, sample_rate)
+    result = " ".join(text for _, _, text in segments).strip()
+    if len(audio):
+        log.info("Transcription: %r", result[:100])
     return result
@@ -1,19 +1,32 @@
 """Piper TTS wrapper — text to 48kHz PCM with resampling and multi-voice support."""
 
+import asyncio
+import hashlib
+import json
 import logging
+import math
 import os
-import urllib.request
+import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import Iterator
 
 import numpy as np
-from scipy.signal import resample
+
+from engine.resample import StreamResampler
 
 log = logging.getLogger("tts")
 
 TARGET_RATE = 48000  # WebRTC Opus expects 48kHz
+FRAME_SAMPLES = 960  # 20ms at 48kHz
+FRAME_BYTES = FRAME_SAMPLES * 2  # 20ms of 48kHz mono int16
 
 MODEL_DIR = Path(__file__).resolve().parent.parent / "models"
 
+# ONNX Runtime intra-op threads for Piper (0 = half the logical cores ≈ physical)
+TTS_THREADS = int(os.getenv("TTS_THREADS", "0")) or max(1, (os.cpu_count() or 2) // 2)
+
 # ── Voice catalog ─────────────────────────────────────────────
 # Each entry maps to a HuggingFace Piper voice model.
 # URL pattern: https://huggingface.co/rhasspy/piper-voices/resolve/main/{lang}/{locale}/{voice_name}/{quality}/{id}.onnx
@@ -33,10 +46,29 @@ VOICE_CATALOG = [
 DEFAULT_VOICE = "en_US-lessac-medium"
 
 _CATALOG_BY_ID = {v["id"]: v for v in VOICE_CATALOG}
+VOICE_IDS = frozenset(_CATALOG_BY_ID)
+
+# list_voices() result; rebuilt only after a download changes what's on disk
+_voices_cache: list[dict] | None = None
 
 # In-memory cache: voice_id → PiperVoice instance
 _voice_cache: dict = {}
 
+# Per-voice locks so concurrent TTS workers download + load a voice once
+_voice_locks: dict[str, threading.Lock] = {}
+_voice_locks_guard = threading.Lock()
+
+# LRU cache: (voice_id, text) → 48kHz PCM bytes, bounded by total size
+PCM_CACHE_MAX_BYTES = 64 * 1024 * 1024  # ~11 minutes of 48kHz mono int16
+_pcm_cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+_pcm_cache_bytes = 0
+_pcm_cache_lock = threading.Lock()  # synthesize() runs in executor threads
+
+# Optional on-disk PCM cache directory, so repeated phrases survive restarts.
+# Files are named by voice and text hash; delete the directory after
+# changing voice models.
+TTS_DISK_CACHE = os.getenv("TTS_DISK_CACHE", "")
+
 
 def _model_url(voice_id: str) -> tuple[str, str]:
     """Build HuggingFace download URLs for a voice's .onnx and .onnx.json."""
@@ -48,25 +80,97 @@ def _model_url(voice_id: str) -> tuple[str, str]:
     return f"{base}.onnx", f"{base}.onnx.json"
 
 
-def _download_model(voice_id: str) -> Path:
-    """Download the Piper ONNX model + config if not already on disk."""
+DOWNLOAD_CHUNK = 1024 * 1024  # stream model files to disk 1MB at a time
+
+
+async def _download_file(client, url: str, path: Path):
+    """Stream url to a unique temp file, then atomically move it into place."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".part")
+    log.info("Downloading %s ...", path.name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async with client.stream("GET", url) as resp:
+                resp.raise_for_status()
+                async for block in resp.aiter_bytes(DOWNLOAD_CHUNK):
+                    f.write(block)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    log.info("Downloaded: %s", path)
+
+
+async def download_models(voice_ids: list[str]) -> list[Path]:
+    """Download Piper ONNX models + configs for several voices concurrently.
+
+    Files already on disk are skipped. Returns the .onnx path per voice.
+    """
+    import httpx
+
     MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    jobs = []
+    onnx_paths = []
+    for voice_id in voice_ids:
+        onnx_path = MODEL_DIR / f"{voice_id}.onnx"
+        config_path = MODEL_DIR / f"{voice_id}.onnx.json"
+        onnx_url, config_url = _model_url(voice_id)
+        onnx_paths.append(onnx_path)
+        if not onnx_path.exists():
+            jobs.append((onnx_url, onnx_path))
+        if not config_path.exists():
+            jobs.append((config_url, config_path))
+
+    if jobs:
+        # HuggingFace "resolve" URLs redirect to a CDN
+        async with httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=httpx.Timeout(30.0, read=120.0),
+            limits=httpx.Limits(max_connections=8),
+        ) as client:
+            await asyncio.gather(*(_download_file(client, url, path) for url, path in jobs))
+        _invalidate_voices()
+    return onnx_paths
+
+
+def _download_model(voice_id: str) -> Path:
+    """Download the Piper ONNX model + config if not already on disk.
+
+    Sync wrapper for worker threads (no running event loop there).
+    """
     onnx_path = MODEL_DIR / f"{voice_id}.onnx"
-    config_path = MODEL_DIR / f"{voice_id}.onnx.json"
+    if onnx_path.exists() and (MODEL_DIR / f"{voice_id}.onnx.json").exists():
+        return onnx_path
+    return asyncio.run(download_models([voice_id]))[0]
+
+
+def _load_piper_voice(model_path: Path):
+    """Build a PiperVoice with a tuned ONNX Runtime session.
 
-    onnx_url, config_url = _model_url(voice_id)
+    PiperVoice.load() uses default SessionOptions; we construct the
+    session ourselves to pin thread count, enable all graph optimizations,
+    and prefer CUDA when onnxruntime was built with it.
+    """
+    import onnxruntime as ort
+    from piper import PiperConfig, PiperVoice
+
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    opts.intra_op_num_threads = TTS_THREADS
+    opts.inter_op_num_threads = 1
+    opts.enable_cpu_mem_arena = True
 
-    if not onnx_path.exists():
-        log.info("Downloading voice model: %s ...", voice_id)
-        urllib.request.urlretrieve(onnx_url, onnx_path)
-        log.info("Model downloaded: %s", onnx_path)
+    providers = ["CPUExecutionProvider"]
+    if "CUDAExecutionProvider" in ort.get_available_providers():
+        providers.insert(0, ("CUDAExecutionProvider", {"cudnn_conv_algo_search": "HEURISTIC"}))
 
-    if not config_path.exists():
-        log.info("Downloading voice config: %s ...", voice_id)
-        urllib.request.urlretrieve(config_url, config_path)
-        log.info("Config downloaded: %s", config_path)
+    config_path = Path(f"{model_path}.json")
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = PiperConfig.from_dict(json.load(f))
 
-    return onnx_path
+    session = ort.InferenceSession(str(model_path), sess_options=opts, providers=providers)
+    log.info("Piper ONNX session: providers=%s, intra_op_threads=%d",
+             session.get_providers(), TTS_THREADS)
+    return PiperVoice(session=session, config=config)
 
 
 def _get_voice(voice_id: str = ""):
@@ -79,60 +183,214 @@ def _get_voice(voice_id: str = ""):
         log.warning("Unknown voice %r, falling back to default", voice_id)
         voice_id = DEFAULT_VOICE
 
-    from piper import PiperVoice
+    with _voice_locks_guard:
+        lock = _voice_locks.setdefault(voice_id, threading.Lock())
+    with lock:
+        # Another worker may have loaded it while we waited
+        if voice_id in _voice_cache:
+            return _voice_cache[voice_id]
+
+        model_path = _download_model(voice_id)
+        log.info("Loading Piper TTS voice: %s", model_path)
+        voice = _load_piper_voice(model_path)
+
+        # Pre-warm: the first run pays ORT allocation/optimization cost
+        for _ in voice.synthesize("Ready."):
+            pass
 
-    model_path = _download_model(voice_id)
-    log.info("Loading Piper TTS voice: %s", model_path)
-    voice = PiperVoice.load(str(model_path))
-    log.info("Piper voice loaded: %s (native rate: %d Hz)", voice_id, voice.config.sample_rate)
-    _voice_cache[voice_id] = voice
+        log.info("Piper voice loaded: %s (native rate: %d Hz)", voice_id, voice.config.sample_rate)
+        _voice_cache[voice_id] = voice
     return voice
 
 
-def synthesize(text: str, voice_id: str = "") -> bytes:
-    """Convert text to 48kHz mono int16 PCM bytes.
+def _to_int16(samples: np.ndarray) -> np.ndarray:
+    """Clip float32 resampler output in place and convert to int16 PCM."""
+    np.clip(samples, -32768, 32767, out=samples)
+    return samples.astype(np.int16)
+
+
+def _frame_views(pcm) -> Iterator[memoryview]:
+    """Slice a bytes-like PCM buffer into zero-copy 20ms memoryview frames."""
+    view = memoryview(pcm).cast("B")
+    for off in range(0, len(view), FRAME_BYTES):
+        yield view[off:off + FRAME_BYTES]
 
-    Pipeline: text -> Piper TTS (22050Hz chunks) -> concat -> resample -> 48kHz PCM
+
+def _synthesize_frames(text: str, voice_id: str) -> Iterator[memoryview]:
+    """Run Piper and resample each chunk as it arrives (no caching).
+
+    Yields 20ms (1920-byte) 48kHz PCM frames as memoryviews over each
+    chunk's int16 array (no per-frame copies); the final frame may be
+    shorter. First audio is available as soon as Piper emits its first
+    chunk instead of after the whole utterance is synthesized.
     """
     voice = _get_voice(voice_id)
     native_rate = voice.config.sample_rate  # typically 22050
 
-    # Synthesize — yields AudioChunk objects
-    raw_parts = []
-    for chunk in voice.synthesize(text):
-        raw_parts.append(chunk.audio_int16_bytes)
+    # 22050 -> 48000 is 320/147
+    g = math.gcd(TARGET_RATE, native_rate)
+    resampler = StreamResampler(TARGET_RATE // g, native_rate // g)
 
-    if not raw_parts:
+    pending = np.empty(0, dtype=np.int16)  # < 1 frame carried to the next chunk
+    in_samples = 0
+    out_bytes = 0
+    for chunk in voice.synthesize(text):
+        samples = np.frombuffer(chunk.audio_int16_bytes, dtype=np.int16)
+        in_samples += len(samples)
+        out = _to_int16(resampler.feed(samples))
+        if len(pending):
+            out = np.concatenate((pending, out))
+        usable = len(out) - len(out) % FRAME_SAMPLES
+        yield from _frame_views(out[:usable])
+        out_bytes += usable * 2
+        pending = out[usable:]
+
+    if not in_samples:
         log.warning("TTS produced no audio for: %r", text[:50])
-        return b""
-
-    raw_pcm = b"".join(raw_parts)
-
-    # Convert to numpy for resampling
-    samples = np.frombuffer(raw_pcm, dtype=np.int16).astype(np.float64)
-    num_output_samples = int(len(samples) * TARGET_RATE / native_rate)
-
-    # Resample from native rate to 48kHz
-    resampled = resample(samples, num_output_samples)
+        return
 
-    # Clip and convert back to int16
-    resampled = np.clip(resampled, -32768, 32767).astype(np.int16)
+    tail = np.concatenate((pending, _to_int16(resampler.flush())))
+    yield from _frame_views(tail)
+    out_bytes += tail.nbytes
 
     log.debug(
         "TTS [%s]: %d chars -> %d samples @ %dHz -> %d samples @ %dHz (%.2fs)",
-        voice_id or DEFAULT_VOICE,
+        voice_id,
         len(text),
-        len(samples),
+        in_samples,
         native_rate,
-        len(resampled),
+        out_bytes // 2,
         TARGET_RATE,
-        len(resampled) / TARGET_RATE,
+        out_bytes / 2 / TARGET_RATE,
     )
-    return resampled.tobytes()
+
+
+def _cache_key(text: str, voice_id: str) -> tuple[str, str]:
+    """Resolve the voice the same way _get_voice does, so aliases share entries."""
+    voice_id = voice_id or DEFAULT_VOICE
+    if voice_id not in _CATALOG_BY_ID:
+        log.warning("Unknown voice %r, falling back to default", voice_id)
+        voice_id = DEFAULT_VOICE
+    return voice_id, text
+
+
+def _disk_path(key: tuple[str, str]) -> Path:
+    digest = hashlib.sha256(key[1].encode("utf-8")).hexdigest()[:16]
+    return Path(TTS_DISK_CACHE) / f"{key[0]}-{digest}.pcm"
+
+
+def _cache_get(key: tuple[str, str]) -> bytes | None:
+    with _pcm_cache_lock:
+        pcm = _pcm_cache.get(key)
+        if pcm is not None:
+            _pcm_cache.move_to_end(key)
+    if pcm is not None:
+        log.debug("TTS cache hit [%s]: %r", key[0], key[1][:50])
+        return pcm
+    if TTS_DISK_CACHE:
+        try:
+            pcm = _disk_path(key).read_bytes()
+        except OSError:
+            return None
+        log.debug("TTS disk cache hit [%s]: %r", key[0], key[1][:50])
+        _cache_put(key, pcm, persist=False)
+    return pcm
+
+
+def _cache_put(key: tuple[str, str], pcm: bytes, persist: bool = True):
+    global _pcm_cache_bytes
+    if not pcm:
+        return
+    if persist and TTS_DISK_CACHE:
+        _disk_put(key, pcm)
+    if len(pcm) > PCM_CACHE_MAX_BYTES:
+        return
+    with _pcm_cache_lock:
+        if key not in _pcm_cache:
+            _pcm_cache[key] = pcm
+            _pcm_cache_bytes += len(pcm)
+        while _pcm_cache_bytes > PCM_CACHE_MAX_BYTES:
+            _, evicted = _pcm_cache.popitem(last=False)
+            _pcm_cache_bytes -= len(evicted)
+
+
+def _disk_put(key: tuple[str, str], pcm: bytes):
+    """Write pcm to the disk cache atomically (readers never see a partial file)."""
+    path = _disk_path(key)
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(pcm)
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("TTS disk cache write failed: %s", e)
+        tmp.unlink(missing_ok=True)
+
+
+def synthesize_stream(text: str, voice_id: str = "") -> Iterator[memoryview]:
+    """Convert text to 48kHz mono int16 PCM, yielded in 20ms frames.
+
+    Frames are memoryviews into the synthesized audio, so queueing them
+    copies nothing — treat them as read-only.
+
+    Pipeline: text -> Piper TTS (22050Hz chunks) -> streaming resample -> 48kHz frames
+
+    Results are cached per (voice, text), so repeated phrases like
+    "Let me look that up." skip inference entirely. A stream is only
+    cached once it has been consumed to the end.
+    """
+    return _stream_cached(_cache_key(text, voice_id))
+
+
+def _stream_cached(key: tuple[str, str]) -> Iterator[memoryview]:
+    pcm = _cache_get(key)
+    if pcm is not None:
+        yield from _frame_views(pcm)
+        return
+
+    text, voice_id = key[1], key[0]
+    frames = []
+    for frame in _synthesize_frames(text, voice_id):
+        frames.append(frame)
+        yield frame
+    _cache_put(key, b"".join(frames))
+
+
+def synthesize(text: str, voice_id: str = "") -> bytes:
+    """Convert text to 48kHz mono int16 PCM bytes (whole utterance)."""
+    key = _cache_key(text, voice_id)
+    pcm = _cache_get(key)
+    if pcm is not None:
+        return pcm
+    return b"".join(_stream_cached(key))
+
+
+def clear_cache():
+    """Drop all cached synthesis results."""
+    global _pcm_cache_bytes
+    with _pcm_cache_lock:
+        _pcm_cache.clear()
+        _pcm_cache_bytes = 0
+
+
+def warmup(voice_id: str = ""):
+    """Load (and pre-warm) a voice so the first utterance doesn't pay for it."""
+    _get_voice(voice_id)
+
+
+def _invalidate_voices():
+    global _voices_cache
+    _voices_cache = None
 
 
 def list_voices() -> list[dict]:
-    """Return voice catalog with download status for each voice."""
+    """Return voice catalog with download status for each voice.
+
+    Cached between downloads — treat the returned list as read-only.
+    """
+    global _voices_cache
+    if _voices_cache is not None:
+        return _voices_cache
     result = []
     for entry in VOICE_CATALOG:
         onnx_path = MODEL_DIR / f"{entry['id']}.onnx"
@@ -141,4 +399,5 @@ def list_voices() -> list[dict]:
             "name": entry["name"],
             "downloaded": onnx_path.exists(),
         })
+    _voices_cache = result
     return result
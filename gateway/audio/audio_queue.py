@@ -6,10 +6,17 @@ Unlike the ring buffer (fixed-size, lossy), this queue:
 - Returns silence when empty
 """
 
+import functools
 import threading
 from collections import deque
 
 
+@functools.lru_cache(maxsize=8)
+def _zeros(n: int) -> bytes:
+    """Shared n-byte silence for padding underruns."""
+    return bytes(n)
+
+
 class AudioQueue:
     """Unbounded FIFO of PCM byte blobs, read out in fixed-size chunks.
 
@@ -19,56 +26,78 @@ class AudioQueue:
     """
 
     def __init__(self):
-        self._chunks: deque[bytes] = deque()
-        self._current = b""  # Partially-consumed chunk
+        self._chunks: deque[memoryview] = deque()
+        self._current = memoryview(b"")  # Partially-consumed chunk
         self._offset = 0
+        self._total = 0  # Unread bytes across _current and _chunks
         self._lock = threading.Lock()
 
     @property
     def available(self) -> int:
         """Total bytes available for reading."""
         with self._lock:
-            total = len(self._current) - self._offset
-            for chunk in self._chunks:
-                total += len(chunk)
-            return total
+            return self._total
 
     def enqueue(self, data: bytes):
         """Append a PCM blob to the queue (thread-safe)."""
         if not data:
             return
         with self._lock:
-            self._chunks.append(data)
+            view = memoryview(data).cast("B")  # Byte-addressed, zero-copy slicing
+            self._chunks.append(view)
+            self._total += view.nbytes
 
     def read(self, n: int) -> bytes:
         """Read exactly n bytes, advancing through queued chunks.
 
         Returns silence (zeros) for any bytes beyond what's available.
         """
+        result = bytearray(n)
+        self.read_into(result)
+        return bytes(result)
+
+    def read_into(self, out: bytearray) -> int:
+        """Fill out from the queue, zero-padding whatever isn't available.
+
+        Returns the number of queued bytes written. Allocates nothing, so
+        the per-frame consumer can reuse one buffer.
+        """
+        n = len(out)
         with self._lock:
-            result = bytearray(n)
-            written = 0
+            current, offset = self._current, self._offset
+            if len(current) - offset >= n:
+                # Common case: the whole frame lies inside the current chunk
+                out[:] = current[offset:offset + n]
+                self._offset = offset + n
+                self._total -= n
+                return n
 
+            written = 0
             while written < n:
                 # Refill current chunk if exhausted
                 if self._offset >= len(self._current):
                     if not self._chunks:
                         break  # No more data — rest is silence
+                    self._current.release()  # Let the drained blob be freed
                     self._current = self._chunks.popleft()
                     self._offset = 0
 
                 # Copy as much as we can from current chunk
                 remaining_in_chunk = len(self._current) - self._offset
                 to_copy = min(remaining_in_chunk, n - written)
-                result[written:written + to_copy] = self._current[self._offset:self._offset + to_copy]
+                out[written:written + to_copy] = self._current[self._offset:self._offset + to_copy]
                 self._offset += to_copy
                 written += to_copy
 
-            return bytes(result)
+            self._total -= written
+        if written < n:
+            out[written:] = _zeros(n - written)
+        return written
 
     def clear(self):
         """Discard all queued audio."""
         with self._lock:
             self._chunks.clear()
-            self._current = b""
+            self._current = memoryview(b"")
             self._offset = 0
+            self._total = 0
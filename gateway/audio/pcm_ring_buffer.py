@@ -1,68 +1,111 @@
-"""Thread-safe ring buffer for PCM audio data.
+"""Single-producer/single-consumer ring buffer for PCM audio data.
 
 Decouples audio producers (TTS engines running in threads) from
 the WebRTC consumer (which pulls every 20ms in the async loop).
 Not used for sine waves (which are computed inline), but ready
 for real TTS integration.
+
+Lock-free on the fast path: the producer only ever stores `_head`, the
+consumer only ever stores `_tail`. Both are plain ints — reads and writes
+of an attribute are atomic under the GIL, as is each memoryview span copy.
+Exactly one producer thread and one consumer thread may use a buffer.
 """
 
 import threading
 
 
 class PCMRingBuffer:
-    """Fixed-size byte ring buffer with thread-safe read/write.
+    """Fixed-size SPSC byte ring buffer.
 
     - write() appends data, silently discarding oldest bytes on overflow
     - read(n) returns exactly n bytes, zero-padding if not enough data
+    - wait_for_data() blocks the consumer until a write lands
+
+    `_head` and `_tail` are monotonic byte counts (never wrapped), so
+    head - tail is the fill level and full/empty need no separate size.
     """
 
     def __init__(self, capacity: int = 48000 * 2 * 2):
         # Default: ~1 second of 48kHz mono 16-bit audio
         self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
         self._capacity = capacity
-        self._write_pos = 0
-        self._read_pos = 0
-        self._size = 0
-        self._lock = threading.Lock()
+        self._head = 0  # total bytes written — producer-owned
+        self._tail = 0  # total bytes consumed — consumer-owned
+        self._data_ready = threading.Event()
 
     @property
     def available(self) -> int:
         """Bytes available for reading."""
-        with self._lock:
-            return self._size
+        return min(self._head - self._tail, self._capacity)
 
     def write(self, data: bytes) -> int:
         """Write data into the buffer. Returns bytes actually written.
 
-        If buffer is full, oldest data is overwritten (lossy).
+        If buffer is full, oldest data is overwritten (lossy) — the consumer
+        notices the overrun and skips ahead. Copies in at most two
+        contiguous spans (before and after the wrap point).
         """
-        with self._lock:
-            n = len(data)
-            for i in range(n):
-                self._buf[self._write_pos] = data[i]
-                self._write_pos = (self._write_pos + 1) % self._capacity
-                if self._size == self._capacity:
-                    # Overwriting unread data — advance read pointer
-                    self._read_pos = (self._read_pos + 1) % self._capacity
-                else:
-                    self._size += 1
-            return n
+        n = len(data)
+        if not n:
+            return 0
+        src = memoryview(data)
+        cap = self._capacity
+        head = self._head
+
+        if n > cap:
+            # Only the newest `cap` bytes survive
+            src = src[n - cap:]
+            start = head + n - cap
+        else:
+            start = head
+
+        pos = start % cap
+        size = len(src)
+        first = min(size, cap - pos)
+        self._view[pos:pos + first] = src[:first]
+        if size > first:
+            self._view[:size - first] = src[first:]
+
+        self._head = head + n  # publish
+        self._data_ready.set()
+        return n
 
     def read(self, n: int) -> bytes:
         """Read up to n bytes. Zero-pads if fewer bytes are available."""
-        with self._lock:
-            available = min(n, self._size)
-            result = bytearray(n)
-            for i in range(available):
-                result[i] = self._buf[self._read_pos]
-                self._read_pos = (self._read_pos + 1) % self._capacity
-            self._size -= available
-            # Remaining bytes in result are already 0 (silence)
-            return bytes(result)
+        cap = self._capacity
+        result = bytearray(n)
+        while True:
+            head = self._head
+            # Producer lapped us — oldest unread bytes are gone
+            tail = max(self._tail, head - cap)
+            available = min(n, head - tail)
+            pos = tail % cap
+            first = min(available, cap - pos)
+            result[:first] = self._view[pos:pos + first]
+            if available > first:
+                result[first:available] = self._view[:available - first]
+            # A write during the copy may have overwritten what we read
+            if self._head - cap <= tail:
+                break
+
+        self._tail = tail + available
+        if available < n:
+            self._data_ready.clear()
+        # Remaining bytes in result are already 0 (silence)
+        return bytes(result)
+
+    def wait_for_data(self, timeout: float | None = None) -> bool:
+        """Block until a write lands (or timeout). Returns True if data is available."""
+        if self._head != self._tail:
+            return True
+        return self._data_ready.wait(timeout)
 
     def clear(self):
-        """Discard all buffered data."""
-        with self._lock:
-            self._write_pos = 0
-            self._read_pos = 0
-            self._size = 0
+        """Discard all buffered data.
+
+        Moves the consumer's tail up to the producer's head, so call it from
+        the consumer side (or while the producer is idle).
+        """
+        self._tail = self._head
+        self._data_ready.clear()
@@ -1,7 +1,6 @@
 """Custom audio track for aiortc that serves PCM frames over WebRTC."""
 
 import asyncio
-import time
 from fractions import Fraction
 
 import numpy as np
@@ -11,6 +10,11 @@ from aiortc import MediaStreamTrack
 SAMPLE_RATE = 48000
 FRAME_SAMPLES = 960  # 20ms at 48kHz
 PTIME = FRAME_SAMPLES / SAMPLE_RATE  # 0.02 seconds
+FRAME_BYTES = FRAME_SAMPLES * 2  # int16 mono
+
+# Shared silent frame payload, shape (channels, samples). from_ndarray copies it.
+_SILENCE = np.zeros((1, FRAME_SAMPLES), dtype=np.int16)
+_TIME_BASE = Fraction(1, SAMPLE_RATE)
 
 
 class WebRTCAudioSource(MediaStreamTrack):
@@ -25,8 +29,19 @@ class WebRTCAudioSource(MediaStreamTrack):
     def __init__(self):
         super().__init__()
         self._generator = None
+        self._loop = None  # Running loop, captured on the first recv()
         self._start_time = None
         self._frame_count = 0
+        self._silence_frame = None  # Built on first idle frame, then reused
+        # Frames pulled ahead via generator.next_bulk(), sliced out 20ms at a time
+        self._prefetch = memoryview(b"")
+        self._prefetch_off = 0
+        self._prefetch_src = None  # Generator the prefetched audio came from
+
+    @property
+    def generator(self):
+        """The attached generator, or None while sending silence."""
+        return self._generator
 
     def set_generator(self, generator):
         """Attach an audio generator (must have a next_chunk() method)."""
@@ -38,33 +53,62 @@ class WebRTCAudioSource(MediaStreamTrack):
 
     async def recv(self) -> AudioFrame:
         """Called by aiortc to get the next audio frame."""
-        # Pace ourselves to avoid busy-spinning
+        # Pace ourselves to avoid busy-spinning — aiortc's sender sends
+        # whatever recv() returns immediately. Uses the loop's own monotonic
+        # clock, the one asyncio.sleep() schedules against.
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = asyncio.get_running_loop()
+        now = loop.time()
         if self._start_time is None:
-            self._start_time = time.monotonic()
+            self._start_time = now
 
         # Calculate when this frame should be delivered
         target_time = self._start_time + self._frame_count * PTIME
-        now = time.monotonic()
         if target_time > now:
             await asyncio.sleep(target_time - now)
 
         self._frame_count += 1
 
-        # Get samples — from generator or silence
-        if self._generator:
-            chunk = self._generator.next_chunk()
-            samples = np.frombuffer(chunk.samples, dtype=np.int16)
-        else:
-            samples = np.zeros(FRAME_SAMPLES, dtype=np.int16)
-
-        # Build av.AudioFrame
-        frame = AudioFrame.from_ndarray(
-            samples.reshape(1, -1),  # shape: (channels, samples)
-            format="s16",
-            layout="mono",
-        )
-        frame.sample_rate = SAMPLE_RATE
-        frame.pts = (self._frame_count - 1) * FRAME_SAMPLES
-        frame.time_base = Fraction(1, SAMPLE_RATE)
+        # Snapshot the generator slot once: set_generator/clear_generator
+        # may swap it from another thread.
+        generator = self._generator
+        pts = (self._frame_count - 1) * FRAME_SAMPLES
+        if generator is None:
+            # Silence is stateless: reuse one frame, only pts changes. The
+            # sender encodes each frame before awaiting the next recv().
+            frame = self._silence_frame
+            if frame is None:
+                frame = self._silence_frame = self._build_frame(_SILENCE)
+            frame.pts = pts
+            return frame
+
+        samples = np.frombuffer(self._next_pcm(generator), dtype=np.int16).reshape(1, -1)
+        frame = self._build_frame(samples)
+        frame.pts = pts
+        return frame
 
+    def _next_pcm(self, generator):
+        """One 20ms frame of PCM, served from a bulk prefetch when supported.
+
+        Generators exposing next_bulk() are asked for several frames at a
+        time; others fall back to one next_chunk() per frame.
+        """
+        if generator is not self._prefetch_src or self._prefetch_off >= len(self._prefetch):
+            next_bulk = getattr(generator, "next_bulk", None)
+            if next_bulk is None:
+                return generator.next_chunk().samples
+            self._prefetch = memoryview(next_bulk().samples)
+            self._prefetch_off = 0
+            self._prefetch_src = generator
+        start = self._prefetch_off
+        self._prefetch_off = start + FRAME_BYTES
+        return self._prefetch[start:start + FRAME_BYTES]
+
+    @staticmethod
+    def _build_frame(samples: np.ndarray) -> AudioFrame:
+        """Wrap (1, N) int16 samples in an av.AudioFrame (pts set by caller)."""
+        frame = AudioFrame.from_ndarray(samples, format="s16", layout="mono")
+        frame.sample_rate = SAMPLE_RATE
+        frame.time_base = _TIME_BASE
         return frame
@@ -1,7 +1,10 @@
 """Self-signed certificate generator for LAN HTTPS testing."""
 
+import datetime
+import ipaddress
 import logging
-import subprocess
+import os
+import tempfile
 from pathlib import Path
 
 log = logging.getLogger("cert")
@@ -9,6 +12,22 @@ log = logging.getLogger("cert")
 CERT_DIR = Path(__file__).resolve().parent.parent / "certs"
 CERT_FILE = CERT_DIR / "cert.pem"
 KEY_FILE = CERT_DIR / "key.pem"
+CERT_DAYS = 365
+
+
+def _write_atomic(path: Path, data: bytes, mode: int = 0o644):
+    """Write data to path via a temp file + rename so readers never see a partial file."""
+    # A fresh, uniquely named temp file: a stale one from a crashed run
+    # can't lend its (looser) permissions to the private key
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
 
 
 def ensure_cert(local_ip: str = "192.168.1.1") -> tuple[Path, Path]:
@@ -21,32 +40,38 @@ def ensure_cert(local_ip: str = "192.168.1.1") -> tuple[Path, Path]:
 
     log.info("Generating self-signed cert for %s...", local_ip)
 
-    # OpenSSL config with SAN for the local IP
-    conf = (
-        f"[req]\n"
-        f"distinguished_name = req_dn\n"
-        f"x509_extensions = v3_req\n"
-        f"prompt = no\n"
-        f"[req_dn]\n"
-        f"CN = WebRTC Speaker Dev\n"
-        f"[v3_req]\n"
-        f"subjectAltName = IP:{local_ip}\n"
-    )
-    conf_path = CERT_DIR / "openssl.cnf"
-    conf_path.write_text(conf)
-
-    subprocess.run(
-        [
-            "openssl", "req", "-x509", "-newkey", "rsa:2048",
-            "-keyout", str(KEY_FILE),
-            "-out", str(CERT_FILE),
-            "-days", "365",
-            "-nodes",
-            "-config", str(conf_path),
-        ],
-        check=True,
-        capture_output=True,
+    # In-process via cryptography (already pulled in by aiortc) — no openssl fork
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    # P-256 generates far faster than RSA-2048 and every current browser accepts it
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "WebRTC Speaker Dev")])
+    try:
+        san = x509.IPAddress(ipaddress.ip_address(local_ip))
+    except ValueError:
+        san = x509.DNSName(local_ip)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=CERT_DAYS))
+        .add_extension(x509.SubjectAlternativeName([san]), critical=False)
+        .sign(key, hashes.SHA256())
     )
 
+    _write_atomic(KEY_FILE, key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ), mode=0o600)
+    _write_atomic(CERT_FILE, cert.public_bytes(serialization.Encoding.PEM))
+
     log.info("Self-signed cert created: %s", CERT_FILE)
     return CERT_FILE, KEY_FILE
@@ -1,21 +1,28 @@
 """Gateway server — HTTP static serving + WebSocket signaling."""
 
 import asyncio
-import json
+import contextlib
+import functools
+import gzip
+import hashlib
+import importlib
 import logging
 import os
 import time
 from pathlib import Path
 
+import orjson
 from aiohttp import web
 from dotenv import load_dotenv
 
 load_dotenv()  # Must be before engine imports so they see .env vars
 
-from engine.tts import list_voices, DEFAULT_VOICE
+from engine import stt, tts
+from engine.tts import list_voices, DEFAULT_VOICE, VOICE_IDS
 from engine.conversation import ConversationHistory
 from engine.llm import (
     generate as llm_generate,
+    generate_stream as llm_generate_stream,
     generate_with_tools as llm_generate_with_tools,
     build_tool_result_messages,
     is_configured as llm_is_configured,
@@ -23,6 +30,7 @@ from engine.llm import (
     available_providers,
     get_available_models,
     pull_ollama_model,
+    close as llm_close,
 )
 from engine.search import (
     search as web_search,
@@ -30,17 +38,40 @@ from engine.search import (
     get_quota_status,
     is_configured as search_is_configured,
 )
-from gateway.turn import fetch_twilio_turn_credentials
+from gateway.turn import fetch_twilio_turn_credentials, close as turn_close
+from gateway import workers
 
 log = logging.getLogger("gateway")
 
 PORT = int(os.getenv("PORT", "8080"))
 AUTH_TOKEN = os.getenv("AUTH_TOKEN", "devtoken")
 ICE_SERVERS_JSON = os.getenv("ICE_SERVERS_JSON", "[]")
+AGENT_MODE = llm_is_configured()  # Depends only on env, fixed at startup
+
+# Static ICE servers used when Twilio TURN isn't available (parsed and
+# validated once, so hello never re-parses or type-checks it)
+try:
+    _ICE_FALLBACK = orjson.loads(ICE_SERVERS_JSON)
+except orjson.JSONDecodeError:
+    log.warning("ICE_SERVERS_JSON is not valid JSON — ignoring")
+    _ICE_FALLBACK = []
+if not isinstance(_ICE_FALLBACK, list):
+    log.warning("ICE_SERVERS_JSON must be a JSON array — ignoring")
+    _ICE_FALLBACK = []
 
 WEB_DIR = Path(__file__).resolve().parent.parent / "web"
 INDEX_TEMPLATE = None  # Loaded on startup
-_START_TIME = None  # Set on app creation
+INDEX_BYTES = b""  # UTF-8 body, rendered once in create_app
+INDEX_GZ = b""  # gzip of INDEX_BYTES for clients that accept it
+INDEX_HEADERS: dict[str, str] = {}
+INDEX_GZ_HEADERS: dict[str, str] = {}
+INDEX_ETAG = ""  # Validator over INDEX_BYTES for If-None-Match revalidation
+INDEX_304_HEADERS: dict[str, str] = {}
+_START_TIME = None  # time.monotonic() at app creation
+_warmup_task = None  # Background model preload started by _on_startup
+_HEALTH_BODY = b'{"status": "ok", "uptime": %r}'
+PULL_PROGRESS_INTERVAL = 0.1  # seconds between pull_progress updates
+PARTIAL_TRANSCRIPT_INTERVAL = 0.1  # seconds partial transcriptions are coalesced over
 
 
 def build_index_html() -> str:
@@ -49,17 +80,75 @@ def build_index_html() -> str:
     return raw.replace("__ICE_SERVERS_PLACEHOLDER__", ICE_SERVERS_JSON)
 
 
+async def _send(ws: web.WebSocketResponse, obj: dict):
+    """Send obj as a JSON text frame, serialized with orjson."""
+    await ws.send_str(orjson.dumps(obj).decode())
+
+
+def _frame(obj: dict) -> str:
+    """Serialize a constant message once at import, for ws.send_str()."""
+    return orjson.dumps(obj).decode()
+
+
+# Constant WS messages, pre-serialized. Sent as text frames because the
+# client JSON.parse()s ev.data, which a binary frame would hand it as a Blob.
+PONG_MSG = _frame({"type": "pong"})
+AGENT_THINKING_MSG = _frame({"type": "agent_thinking"})
+AGENT_SEARCHING_MSG = _frame({"type": "agent_searching"})
+ERR_BAD_TOKEN = _frame({"type": "error", "message": "Bad token"})
+ERR_INVALID_JSON = _frame({"type": "error", "message": "Invalid JSON"})
+ERR_MISSING_SDP = _frame({"type": "error", "message": "Missing SDP"})
+ERR_NO_SESSION = _frame({"type": "error", "message": "No WebRTC session"})
+ERR_EMPTY_TEXT = _frame({"type": "error", "message": "Empty text"})
+ERR_MISSING_MODEL = _frame({"type": "error", "message": "Missing model name"})
+
+
+# Last serialized hello_ack minus ICE servers / quota: (inputs, bytes).
+# tts_voices and model_catalog are memoized upstream, so identity tells
+# us whether they changed (a pull rebuilds the catalog).
+_hello_cache: tuple[tuple, bytes] | None = None
+
+
+def _hello_ack_static(tts_voices: list, model_catalog: dict, default_provider: str,
+                      default_model: str, tts_voice: str, search_enabled: bool) -> bytes:
+    """Return the JSON object bytes for the connection-independent part of hello_ack."""
+    global _hello_cache
+    key = (default_provider, default_model, tts_voice, search_enabled)
+    if _hello_cache is not None:
+        (voices, catalog, cached_key), data = _hello_cache
+        if voices is tts_voices and catalog is model_catalog and cached_key == key:
+            return data
+    data = orjson.dumps({
+        "type": "hello_ack",
+        "voices": tts_voices,
+        "tts_voices": tts_voices,
+        "tts_default_voice": tts_voice,
+        "llm_providers": available_providers(),
+        "llm_default": default_provider,
+        "model_catalog": model_catalog,
+        "llm_default_provider": default_provider,
+        "llm_default_model": default_model,
+        "search_enabled": search_enabled,
+    })
+    _hello_cache = ((tts_voices, model_catalog, key), data)
+    return data
+
+
 # ── HTTP routes ───────────────────────────────────────────────
 
 async def handle_index(request: web.Request) -> web.Response:
-    """Serve index.html with injected config."""
-    return web.Response(text=INDEX_TEMPLATE, content_type="text/html")
+    """Serve index.html with injected config (pre-encoded at startup)."""
+    if request.headers.get("If-None-Match") == INDEX_ETAG:
+        return web.Response(status=304, headers=INDEX_304_HEADERS)
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        return web.Response(body=INDEX_GZ, headers=INDEX_GZ_HEADERS)
+    return web.Response(body=INDEX_BYTES, headers=INDEX_HEADERS)
 
 
 async def handle_health(request: web.Request) -> web.Response:
     """Lightweight health check — confirms event loop is responsive."""
-    uptime = round(time.time() - _START_TIME, 1) if _START_TIME else 0
-    return web.json_response({"status": "ok", "uptime": uptime})
+    uptime = round(time.monotonic() - _START_TIME, 1) if _START_TIME is not None else 0
+    return web.Response(body=_HEALTH_BODY % uptime, content_type="application/json")
 
 
 async def handle_quota(request: web.Request) -> web.Response:
@@ -126,6 +215,22 @@ async def _extract_search_query(text: str, provider: str, model: str) -> str:
     return text  # fallback to raw text
 
 
+SUMMARY_PROMPT = (
+    "Summarize this conversation between a user and a voice assistant in "
+    "two or three sentences. Keep names, facts, and open questions; drop "
+    "small talk. Reply with ONLY the summary."
+)
+
+
+def _history_summarizer(provider: str, model: str):
+    """Build the summarize callback ConversationHistory.maybe_compact() expects."""
+    async def summarize(previous: str, transcript: str) -> str:
+        content = f"Earlier summary: {previous}\n\n{transcript}" if previous else transcript
+        return await llm_generate(SUMMARY_PROMPT, [{"role": "user", "content": content}],
+                                  provider, model)
+    return summarize
+
+
 # ── Search hedging detection (safety net) ─────────────────────
 
 # Phrases that indicate the LLM is refusing or hedging — trigger search fallback
@@ -194,318 +299,453 @@ async def handle_ws(request: web.Request) -> web.WebSocketResponse:
 
     session = None  # Will hold WebRTC Session once created
     ice_servers = []  # Populated on hello, shared with WebRTC session
-    conversation = ConversationHistory()
-    agent_mode = llm_is_configured()
+    conversation = None  # ConversationHistory, created on the first agent turn
     llm_provider = ""  # Empty = use default from env
     llm_model = ""  # Empty = use OLLAMA_MODEL env var
     tts_voice = DEFAULT_VOICE
     search_enabled = True  # User toggle, defaults ON
+    partial_text = None  # Latest partial transcription not yet sent
+    partial_flush = None  # Task that sends partial_text after PARTIAL_TRANSCRIPT_INTERVAL
+    agent_task = None  # In-flight _agent_turn(), so the WS loop can take barge-in
+    # Start the TURN lookup now so it overlaps the client's hello — it is
+    # served from gateway.turn's shared cache, so unauthenticated connects
+    # don't each cost a Twilio API call
+    turn_task = asyncio.create_task(fetch_twilio_turn_credentials())
+
+    async def _on_hello(msg):
+        nonlocal ice_servers, llm_provider, llm_model, turn_task
+        token = msg.get("token", "")
+        if token != AUTH_TOKEN:
+            await ws.send_str(ERR_BAD_TOKEN)
+            await ws.close()  # ends the receive loop below
+            return
+        # TURN credentials (falls back to ICE_SERVERS_JSON); the first hello
+        # uses the lookup started on connect, a repeat hello looks up again
+        turn = turn_task or fetch_twilio_turn_credentials()
+        turn_task = None
+        ice_servers, model_catalog, search_quota = await asyncio.gather(
+            turn, get_available_models(), get_quota_status(),
+        )
+        if not ice_servers:
+            ice_servers = _ICE_FALLBACK
+        tts_voices = list_voices()
+        # Default to Ollama if it has installed models, else fall back to cloud
+        default_model = ""
+        if model_catalog["ollama_installed"]:
+            default_provider = "ollama"
+            default_model = model_catalog["ollama_installed"][0]["name"]
+            # Set session state so the agent loop actually uses Ollama
+            llm_provider = "ollama"
+            llm_model = default_model
+            log.info("Default model: ollama/%s", default_model)
+        else:
+            default_provider = get_provider_name()
+        static = _hello_ack_static(
+            tts_voices, model_catalog, default_provider, default_model,
+            tts_voice, search_enabled,
+        )
+        # Splice the per-connection fields onto the cached static object
+        dynamic = orjson.dumps({"ice_servers": ice_servers, "search_quota": search_quota})
+        await ws.send_str((static[:-1] + b"," + dynamic[1:]).decode())
+
+    async def _on_webrtc_offer(msg):
+        nonlocal session
+        sdp = msg.get("sdp", "")
+        if not sdp:
+            await ws.send_str(ERR_MISSING_SDP)
+            return
+        if session is None or not session.accepts_offer(sdp):
+            # New browser peer connection — replace any previous session
+            if session is not None:
+                await session.close()
+            # Usually already imported by the startup warmup (a sys.modules hit)
+            from gateway.webrtc import Session
+            session = Session(ice_servers=ice_servers)
+        answer_sdp = await session.handle_offer(sdp)
+        await _send(ws, {"type": "webrtc_answer", "sdp": answer_sdp})
+
+    async def _on_start(msg):
+        voice_id = msg.get("voice_id", "")
+        if session:
+            session.start_audio(voice_id)
+            log.info("Audio started: %s", voice_id)
+        else:
+            await ws.send_str(ERR_NO_SESSION)
+
+    async def _on_stop(msg):
+        if session:
+            session.stop_audio()
+            log.info("Audio stopped")
+
+    async def _on_speak(msg):
+        text = msg.get("text", "").strip()
+        if not text:
+            await ws.send_str(ERR_EMPTY_TEXT)
+        elif session:
+            log.info("TTS speak: %r (voice=%s)", text[:80], tts_voice)
+            await session.speak_text(text, voice_id=tts_voice)
+        else:
+            await ws.send_str(ERR_NO_SESSION)
+
+    async def _on_set_provider(msg):
+        nonlocal llm_provider
+        provider = msg.get("provider", "")
+        if provider in ("claude", "openai", "ollama"):
+            llm_provider = provider
+            log.info("LLM provider switched to: %s", provider)
+            await _send(ws, {"type": "provider_set", "provider": provider})
+        else:
+            await _send(ws, {"type": "error", "message": f"Unknown provider: {provider}"})
+
+    async def _on_set_model(msg):
+        nonlocal llm_provider, llm_model
+        provider = msg.get("provider", "")
+        model = msg.get("model", "")
+        if provider in ("claude", "openai", "ollama"):
+            llm_provider = provider
+            llm_model = model if provider == "ollama" else ""
+            if conversation is not None:
+                conversation.clear()
+            log.info("Model switched: provider=%s, model=%s (conversation cleared)", provider, model)
+            await _send(ws, {"type": "model_set", "provider": provider, "model": model})
+        else:
+            await _send(ws, {"type": "error", "message": f"Unknown provider: {provider}"})
+
+    async def _on_set_voice(msg):
+        nonlocal tts_voice
+        voice_id = msg.get("voice_id", "")
+        if voice_id in VOICE_IDS:
+            tts_voice = voice_id
+            log.info("Voice switched to: %s", voice_id)
+            await _send(ws, {
+                "type": "voice_set",
+                "voice_id": voice_id,
+                "tts_voices": list_voices(),
+            })
+        else:
+            await _send(ws, {"type": "error", "message": f"Unknown voice: {voice_id}"})
+
+    async def _on_pull_model(msg):
+        model_name = msg.get("model", "")
+        if not model_name:
+            await ws.send_str(ERR_MISSING_MODEL)
+            return
+        log.info("Starting model pull: %s", model_name)
+        await _send(ws, {"type": "pull_started", "model": model_name})
+
+        # Run pull as background task so the WS message loop stays responsive
+        async def _do_pull(ws, model_name):
+            # Ollama emits many progress events/sec; keep only the latest
+            # and flush it at most every PULL_PROGRESS_INTERVAL
+            latest = None
+            sent = None
+
+            async def _flush():
+                nonlocal sent
+                if latest is not sent and not ws.closed:
+                    sent = latest
+                    await _send(ws, latest)
+
+            async def _flusher():
+                while True:
+                    await asyncio.sleep(PULL_PROGRESS_INTERVAL)
+                    await _flush()
+
+            flusher = asyncio.create_task(_flusher())
+            try:
+                async for progress in pull_ollama_model(model_name):
+                    if ws.closed:
+                        log.warning("WS closed during pull of %s", model_name)
+                        return
+                    status = progress.get("status", "")
+                    total = progress.get("total", 0)
+                    completed = progress.get("completed", 0)
+                    pct = completed * 100 // total if total > 0 else 0
+                    # The UI only renders status + percent; skip no-op ticks
+                    if latest and latest["percent"] == pct and latest["status"] == status:
+                        continue
+                    latest = {
+                        "type": "pull_progress",
+                        "model": model_name,
+                        "status": status,
+                        "percent": pct,
+                        "total": total,
+                        "completed": completed,
+                    }
+                flusher.cancel()
+                await _flush()
+                if not ws.closed:
+                    updated_catalog = await get_available_models(fresh=True)
+                    await _send(ws, {
+                        "type": "pull_complete",
+                        "model": model_name,
+                        "model_catalog": updated_catalog,
+                    })
+                log.info("Model pull complete: %s", model_name)
+            except Exception as e:
+                log.error("Model pull failed: %s — %s", model_name, e)
+                if not ws.closed:
+                    await _send(ws, {"type": "pull_error", "model": model_name, "message": str(e)})
+            finally:
+                flusher.cancel()
+                # Retrieve its outcome: a send racing the WS closing may have killed it
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await flusher
+
+        asyncio.create_task(_do_pull(ws, model_name))
+
+    async def _on_stop_speaking(msg):
+        if session:
+            session.stop_speaking()
+            log.info("TTS playback stopped by user")
+
+    async def _flush_partial():
+        nonlocal partial_text, partial_flush
+        await asyncio.sleep(PARTIAL_TRANSCRIPT_INTERVAL)
+        text, partial_text, partial_flush = partial_text, None, None
+        if text is not None and not ws.closed:
+            await _send(ws, {"type": "transcription", "text": text, "partial": True})
+            log.debug("Partial transcription: %r", text[:80])
+
+    def _drop_pending_partial():
+        """Forget an unsent partial so it can't land after the final transcript."""
+        nonlocal partial_text, partial_flush
+        if partial_flush is not None:
+            partial_flush.cancel()
+        partial_text = partial_flush = None
+
+    async def _on_mic_start(msg):
+        if session:
+            async def on_transcription(text, partial):
+                nonlocal partial_text, partial_flush
+                if not partial:
+                    _drop_pending_partial()
+                    await _send(ws, {"type": "transcription", "text": text, "partial": False})
+                    return
+                # Coalesce partials: only the newest one per interval is sent
+                partial_text = text
+                if partial_flush is None:
+                    partial_flush = asyncio.create_task(_flush_partial())
+            session.start_recording(on_transcription=on_transcription)
+            log.info("Mic recording started (live)")
+        else:
+            await ws.send_str(ERR_NO_SESSION)
+
+    async def _agent_turn(text):
+        """Agent mode: tool-call → [search?] → reply → [hedging? → search → retry].
+
+        Runs as agent_task so the receive loop stays free to handle
+        stop_speaking (barge-in) while the reply is generated and spoken.
+        """
+        nonlocal conversation
+        if conversation is None:
+            conversation = ConversationHistory()
+        conversation.add_turn("user", text)
+        active_provider = llm_provider or get_provider_name()
+        use_tools = search_enabled and search_is_configured()
+        tools = [SEARCH_TOOL] if use_tools else []
+        messages = conversation.get_messages()
+
+        try:
+            await ws.send_str(AGENT_THINKING_MSG)
+            log.info("Agent thinking (provider=%s, tools=%d)...",
+                     active_provider, len(tools))
+
+            if not tools:
+                # ── No tools: stream the reply straight into TTS ──
+                reply = await session.speak_stream(
+                    llm_generate_stream(
+                        conversation.system, messages,
+                        llm_provider, llm_model,
+                    ),
+                    voice_id=tts_voice,
+                )
+                conversation.add_turn("assistant", reply)
+                conversation.maybe_compact(_history_summarizer(llm_provider, llm_model))
+                await _send(ws, {"type": "agent_reply", "text": reply})
+                log.info("Agent reply (streamed): %r (voice=%s)",
+                         reply[:80], tts_voice)
+                return
+
+            # ── Primary: generate with tool calling ──
+            reply, tool_calls = await llm_generate_with_tools(
+                conversation.system, messages, tools,
+                llm_provider, llm_model,
+            )
+
+            # Handle tool calls (model decided to search)
+            search_performed = False
+            spoken = False  # Set once the final reply was streamed into TTS
+            if tool_calls:
+                for i, tc in enumerate(tool_calls):
+                    func = tc.get("function", {})
+                    if func.get("name") == "web_search":
+                        query = func.get("arguments", {}).get("query", text)
+                        log.info("Tool call: web_search(%r)", query)
+
+                        await _send(ws, {"type": "agent_reply",
+                                            "text": LOOKUP_PHRASE})
+                        await session.speak_text(LOOKUP_PHRASE,
+                                                 voice_id=tts_voice)
+                        await ws.send_str(AGENT_SEARCHING_MSG)
+
+                        try:
+                            search_result = await web_search(query)
+                            if search_result:
+                                context = format_results_for_context(
+                                    search_result)
+                                log.info(
+                                    "Search via %s: %d results for %r",
+                                    search_result["provider"],
+                                    len(search_result["results"]),
+                                    query[:60],
+                                )
+                                # Build tool result messages
+                                tool_msgs = build_tool_result_messages(
+                                    active_provider, tool_calls,
+                                    {i: context}, reply,
+                                )
+                                await ws.send_str(AGENT_THINKING_MSG)
+                                # No tools on followup — speak it as it streams
+                                reply = await session.speak_stream(
+                                    llm_generate_stream(
+                                        conversation.system,
+                                        messages + tool_msgs,
+                                        llm_provider, llm_model,
+                                    ),
+                                    voice_id=tts_voice,
+                                )
+                                search_performed = spoken = True
+                        except Exception as e:
+                            log.warning("Tool search failed: %s", e)
+
+            # ── Safety net: model didn't use tools but hedged ──
+            if (not search_performed and not tool_calls
+                    and use_tools and _reply_is_hedging(reply)):
+                log.info("LLM hedged without tools, safety net search")
+                search_query = await _extract_search_query(
+                    text, llm_provider, llm_model)
+
+                await _send(ws, {"type": "agent_reply",
+                                    "text": LOOKUP_PHRASE})
+                await session.speak_text(LOOKUP_PHRASE,
+                                         voice_id=tts_voice)
+                await ws.send_str(AGENT_SEARCHING_MSG)
+                try:
+                    search_result = await web_search(search_query)
+                    if search_result:
+                        context = format_results_for_context(
+                            search_result)
+                        log.info("Safety net search via %s: %d results",
+                                 search_result["provider"],
+                                 len(search_result["results"]))
+                        # Inject as assistant message (fallback path)
+                        search_msgs = messages + [{
+                            "role": "assistant",
+                            "content": (
+                                "I searched the web and found:\n\n"
+                                + context
+                                + "\nI'll use these results to answer."
+                            ),
+                        }]
+                        await ws.send_str(AGENT_THINKING_MSG)
+                        reply = await session.speak_stream(
+                            llm_generate_stream(
+                                conversation.system, search_msgs,
+                                llm_provider, llm_model,
+                            ),
+                            voice_id=tts_voice,
+                        )
+                        spoken = True
+                except Exception as e:
+                    log.warning("Safety net search failed: %s", e)
+
+            conversation.add_turn("assistant", reply)
+            conversation.maybe_compact(_history_summarizer(llm_provider, llm_model))
+            await _send(ws, {"type": "agent_reply", "text": reply})
+            log.info("Agent reply: %r (voice=%s)", reply[:80], tts_voice)
+            if not spoken:
+                await session.speak_text(reply, voice_id=tts_voice)
+        except Exception as e:
+            log.error("LLM error: %s", e)
+            if not ws.closed:
+                await _send(ws, {"type": "error", "message": f"LLM error: {e}"})
+
+    async def _cancel_agent_turn():
+        """Cancel the in-flight agent turn, if any, and wait for it to unwind."""
+        nonlocal agent_task
+        if agent_task is not None:
+            agent_task.cancel()
+            # _agent_turn logs its own errors; only the cancellation is expected here
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await agent_task
+            agent_task = None
+
+    async def _on_mic_stop(msg):
+        nonlocal agent_task
+        if session:
+            log.info("Mic recording stopping, final STT...")
+            text = await session.stop_recording()
+            _drop_pending_partial()
+            await _send(ws, {"type": "transcription", "text": text, "partial": False})
+            log.info("Final transcription: %r", text[:80] if text else "")
+
+            if AGENT_MODE and text.strip():
+                # A new utterance supersedes a reply still in progress
+                await _cancel_agent_turn()
+                agent_task = asyncio.create_task(_agent_turn(text))
+        else:
+            await ws.send_str(ERR_NO_SESSION)
+
+    async def _on_set_search_enabled(msg):
+        nonlocal search_enabled
+        search_enabled = msg.get("enabled", True)
+        log.info("Web search %s by user", "enabled" if search_enabled else "disabled")
+        await _send(ws, {"type": "search_enabled_set", "enabled": search_enabled})
+
+    async def _on_ping(msg):
+        await ws.send_str(PONG_MSG)
+
+    handlers = {
+        "hello": _on_hello,
+        "webrtc_offer": _on_webrtc_offer,
+        "start": _on_start,
+        "stop": _on_stop,
+        "speak": _on_speak,
+        "set_provider": _on_set_provider,
+        "set_model": _on_set_model,
+        "set_voice": _on_set_voice,
+        "pull_model": _on_pull_model,
+        "stop_speaking": _on_stop_speaking,
+        "mic_start": _on_mic_start,
+        "mic_stop": _on_mic_stop,
+        "set_search_enabled": _on_set_search_enabled,
+        "ping": _on_ping,
+    }
 
     async for raw in ws:
-        if raw.type != web.WSMsgType.TEXT:
+        # orjson parses str and bytes alike, so binary JSON frames need no decode
+        if raw.type not in (web.WSMsgType.TEXT, web.WSMsgType.BINARY):
             continue
         try:
-            msg = json.loads(raw.data)
-        except json.JSONDecodeError:
-            await ws.send_json({"type": "error", "message": "Invalid JSON"})
+            msg = orjson.loads(raw.data)
+        except orjson.JSONDecodeError:
+            await ws.send_str(ERR_INVALID_JSON)
             continue
 
         msg_type = msg.get("type")
         log.debug("WS recv: %s", msg_type)
 
-        if msg_type == "hello":
-            token = msg.get("token", "")
-            if token != AUTH_TOKEN:
-                await ws.send_json({"type": "error", "message": "Bad token"})
-                await ws.close()
-                break
-            # Fetch fresh TURN credentials (falls back to ICE_SERVERS_JSON)
-            ice_servers = await fetch_twilio_turn_credentials()
-            if not ice_servers:
-                try:
-                    ice_servers = json.loads(ICE_SERVERS_JSON)
-                except json.JSONDecodeError:
-                    ice_servers = []
-            tts_voices = list_voices()
-            model_catalog = await get_available_models()
-            # Default to Ollama if it has installed models, else fall back to cloud
-            default_model = ""
-            if model_catalog["ollama_installed"]:
-                default_provider = "ollama"
-                default_model = model_catalog["ollama_installed"][0]["name"]
-                # Set session state so the agent loop actually uses Ollama
-                llm_provider = "ollama"
-                llm_model = default_model
-                log.info("Default model: ollama/%s", default_model)
-            else:
-                default_provider = get_provider_name()
-            search_quota = await get_quota_status()
-            await ws.send_json({
-                "type": "hello_ack",
-                "voices": tts_voices,
-                "tts_voices": tts_voices,
-                "tts_default_voice": tts_voice,
-                "ice_servers": ice_servers,
-                "llm_providers": available_providers(),
-                "llm_default": default_provider,
-                "model_catalog": model_catalog,
-                "llm_default_provider": default_provider,
-                "llm_default_model": default_model,
-                "search_enabled": search_enabled,
-                "search_quota": search_quota,
-            })
-
-        elif msg_type == "webrtc_offer":
-            sdp = msg.get("sdp", "")
-            if not sdp:
-                await ws.send_json({"type": "error", "message": "Missing SDP"})
-                continue
-            # Lazy import to avoid loading aiortc until needed
-            from gateway.webrtc import Session
-            session = Session(ice_servers=ice_servers)
-            answer_sdp = await session.handle_offer(sdp)
-            await ws.send_json({"type": "webrtc_answer", "sdp": answer_sdp})
-
-        elif msg_type == "start":
-            voice_id = msg.get("voice_id", "")
-            if session:
-                session.start_audio(voice_id)
-                log.info("Audio started: %s", voice_id)
-            else:
-                await ws.send_json({"type": "error", "message": "No WebRTC session"})
-
-        elif msg_type == "stop":
-            if session:
-                session.stop_audio()
-                log.info("Audio stopped")
-
-        elif msg_type == "speak":
-            text = msg.get("text", "").strip()
-            if not text:
-                await ws.send_json({"type": "error", "message": "Empty text"})
-            elif session:
-                log.info("TTS speak: %r (voice=%s)", text[:80], tts_voice)
-                await session.speak_text(text, voice_id=tts_voice)
-            else:
-                await ws.send_json({"type": "error", "message": "No WebRTC session"})
-
-        elif msg_type == "set_provider":
-            provider = msg.get("provider", "")
-            if provider in ("claude", "openai", "ollama"):
-                llm_provider = provider
-                log.info("LLM provider switched to: %s", provider)
-                await ws.send_json({"type": "provider_set", "provider": provider})
-            else:
-                await ws.send_json({"type": "error", "message": f"Unknown provider: {provider}"})
-
-        elif msg_type == "set_model":
-            provider = msg.get("provider", "")
-            model = msg.get("model", "")
-            if provider in ("claude", "openai", "ollama"):
-                llm_provider = provider
-                llm_model = model if provider == "ollama" else ""
-                conversation.clear()
-                log.info("Model switched: provider=%s, model=%s (conversation cleared)", provider, model)
-                await ws.send_json({"type": "model_set", "provider": provider, "model": model})
-            else:
-                await ws.send_json({"type": "error", "message": f"Unknown provider: {provider}"})
-
-        elif msg_type == "set_voice":
-            voice_id = msg.get("voice_id", "")
-            known_ids = {v["id"] for v in list_voices()}
-            if voice_id in known_ids:
-                tts_voice = voice_id
-                log.info("Voice switched to: %s", voice_id)
-                await ws.send_json({
-                    "type": "voice_set",
-                    "voice_id": voice_id,
-                    "tts_voices": list_voices(),
-                })
-            else:
-                await ws.send_json({"type": "error", "message": f"Unknown voice: {voice_id}"})
-
-        elif msg_type == "pull_model":
-            model_name = msg.get("model", "")
-            if not model_name:
-                await ws.send_json({"type": "error", "message": "Missing model name"})
-                continue
-            log.info("Starting model pull: %s", model_name)
-            await ws.send_json({"type": "pull_started", "model": model_name})
-
-            # Run pull as background task so the WS message loop stays responsive
-            async def _do_pull(ws, model_name):
-                try:
-                    async for progress in pull_ollama_model(model_name):
-                        if ws.closed:
-                            log.warning("WS closed during pull of %s", model_name)
-                            return
-                        status = progress.get("status", "")
-                        total = progress.get("total", 0)
-                        completed = progress.get("completed", 0)
-                        pct = int(completed / total * 100) if total > 0 else 0
-                        await ws.send_json({
-                            "type": "pull_progress",
-                            "model": model_name,
-                            "status": status,
-                            "percent": pct,
-                            "total": total,
-                            "completed": completed,
-                        })
-                    if not ws.closed:
-                        updated_catalog = await get_available_models()
-                        await ws.send_json({"type": "pull_complete", "model": model_name})
-                        await ws.send_json({"type": "model_catalog_update", "model_catalog": updated_catalog})
-                    log.info("Model pull complete: %s", model_name)
-                except Exception as e:
-                    log.error("Model pull failed: %s — %s", model_name, e)
-                    if not ws.closed:
-                        await ws.send_json({"type": "pull_error", "model": model_name, "message": str(e)})
-
-            asyncio.create_task(_do_pull(ws, model_name))
-
-        elif msg_type == "stop_speaking":
-            if session:
-                session.stop_speaking()
-                log.info("TTS playback stopped by user")
-
-        elif msg_type == "mic_start":
-            if session:
-                async def on_transcription(text, partial):
-                    await ws.send_json({"type": "transcription", "text": text, "partial": partial})
-                    log.debug("Partial transcription: %r", text[:80] if text else "")
-                session.start_recording(on_transcription=on_transcription)
-                log.info("Mic recording started (live)")
-            else:
-                await ws.send_json({"type": "error", "message": "No WebRTC session"})
-
-        elif msg_type == "mic_stop":
-            if session:
-                log.info("Mic recording stopping, final STT...")
-                text = await session.stop_recording()
-                await ws.send_json({"type": "transcription", "text": text, "partial": False})
-                log.info("Final transcription: %r", text[:80] if text else "")
-
-                # Agent mode: tool-call → [search?] → reply → [hedging? → search → retry]
-                if agent_mode and text.strip():
-                    conversation.add_turn("user", text)
-                    active_provider = llm_provider or get_provider_name()
-                    use_tools = search_enabled and search_is_configured()
-                    tools = [SEARCH_TOOL] if use_tools else []
-                    messages = conversation.get_messages()
-
-                    await ws.send_json({"type": "agent_thinking"})
-                    log.info("Agent thinking (provider=%s, tools=%d)...",
-                             active_provider, len(tools))
-
-                    try:
-                        # ── Primary: generate with tool calling ──
-                        reply, tool_calls = await llm_generate_with_tools(
-                            conversation.system, messages, tools,
-                            llm_provider, llm_model,
-                        )
-
-                        # Handle tool calls (model decided to search)
-                        search_performed = False
-                        if tool_calls:
-                            for i, tc in enumerate(tool_calls):
-                                func = tc.get("function", {})
-                                if func.get("name") == "web_search":
-                                    query = func.get("arguments", {}).get("query", text)
-                                    log.info("Tool call: web_search(%r)", query)
-
-                                    await ws.send_json({"type": "agent_reply",
-                                                        "text": LOOKUP_PHRASE})
-                                    await session.speak_text(LOOKUP_PHRASE,
-                                                             voice_id=tts_voice)
-                                    await ws.send_json({"type": "agent_searching"})
-
-                                    try:
-                                        search_result = await web_search(query)
-                                        if search_result:
-                                            context = format_results_for_context(
-                                                search_result)
-                                            log.info(
-                                                "Search via %s: %d results for %r",
-                                                search_result["provider"],
-                                                len(search_result["results"]),
-                                                query[:60],
-                                            )
-                                            # Build tool result messages
-                                            tool_msgs = build_tool_result_messages(
-                                                active_provider, tool_calls,
-                                                {i: context}, reply,
-                                            )
-                                            await ws.send_json(
-                                                {"type": "agent_thinking"})
-                                            reply, _ = await llm_generate_with_tools(
-                                                conversation.system,
-                                                messages + tool_msgs,
-                                                [],  # no tools on followup
-                                                llm_provider, llm_model,
-                                            )
-                                            search_performed = True
-                                    except Exception as e:
-                                        log.warning("Tool search failed: %s", e)
-
-                        # ── Safety net: model didn't use tools but hedged ──
-                        if (not search_performed and not tool_calls
-                                and use_tools and _reply_is_hedging(reply)):
-                            log.info("LLM hedged without tools, safety net search")
-                            search_query = await _extract_search_query(
-                                text, llm_provider, llm_model)
-
-                            await ws.send_json({"type": "agent_reply",
-                                                "text": LOOKUP_PHRASE})
-                            await session.speak_text(LOOKUP_PHRASE,
-                                                     voice_id=tts_voice)
-                            await ws.send_json({"type": "agent_searching"})
-                            try:
-                                search_result = await web_search(search_query)
-                                if search_result:
-                                    context = format_results_for_context(
-                                        search_result)
-                                    log.info("Safety net search via %s: %d results",
-                                             search_result["provider"],
-                                             len(search_result["results"]))
-                                    # Inject as assistant message (fallback path)
-                                    search_msgs = messages + [{
-                                        "role": "assistant",
-                                        "content": (
-                                            "I searched the web and found:\n\n"
-                                            + context
-                                            + "\nI'll use these results to answer."
-                                        ),
-                                    }]
-                                    await ws.send_json({"type": "agent_thinking"})
-                                    reply = await llm_generate(
-                                        conversation.system, search_msgs,
-                                        llm_provider, llm_model,
-                                    )
-                            except Exception as e:
-                                log.warning("Safety net search failed: %s", e)
-
-                        conversation.add_turn("assistant", reply)
-                        await ws.send_json({"type": "agent_reply", "text": reply})
-                        log.info("Agent reply: %r (voice=%s)", reply[:80], tts_voice)
-                        await session.speak_text(reply, voice_id=tts_voice)
-                    except Exception as e:
-                        log.error("LLM error: %s", e)
-                        await ws.send_json({"type": "error", "message": f"LLM error: {e}"})
-            else:
-                await ws.send_json({"type": "error", "message": "No WebRTC session"})
-
-        elif msg_type == "set_search_enabled":
-            search_enabled = msg.get("enabled", True)
-            log.info("Web search %s by user", "enabled" if search_enabled else "disabled")
-            await ws.send_json({"type": "search_enabled_set", "enabled": search_enabled})
-
-        elif msg_type == "ping":
-            await ws.send_json({"type": "pong"})
-
+        handler = handlers.get(msg_type)
+        if handler is not None:
+            await handler(msg)
         else:
-            await ws.send_json({"type": "error", "message": f"Unknown type: {msg_type}"})
+            await _send(ws, {"type": "error", "message": f"Unknown type: {msg_type}"})
 
     # Cleanup on disconnect
+    if turn_task is not None:
+        turn_task.cancel()  # Closed before (or without) a valid hello
+    await _cancel_agent_turn()
     if session:
         await session.close()
     log.info("WebSocket disconnected")
@@ -514,10 +754,64 @@ async def handle_ws(request: web.Request) -> web.WebSocketResponse:
 
 # ── App setup ─────────────────────────────────────────────────
 
+async def _warmup(name: str, pool, fn):
+    """Run one warmup in its executor; failures just mean lazy loading later."""
+    t0 = time.monotonic()
+    try:
+        await asyncio.get_running_loop().run_in_executor(pool, fn)
+        log.info("Warmup %s: %.2fs", name, time.monotonic() - t0)
+    except Exception as e:
+        log.warning("Warmup %s failed (will load lazily): %s", name, e)
+
+
+async def _on_startup(app: web.Application):
+    """Preload aiortc and STT/TTS models so the first connection doesn't pay cold-start cost.
+
+    Runs in the background so the server listens immediately (a first run
+    downloads models); anything requested before it finishes loads lazily.
+    """
+    global _warmup_task
+    _warmup_task = asyncio.ensure_future(asyncio.gather(
+        _warmup("aiortc", None, functools.partial(importlib.import_module, "gateway.webrtc")),
+        _warmup("whisper", workers.STT_POOL, stt.warmup),
+        _warmup("piper", workers.TTS_POOL, tts.warmup),
+    ))
+
+
+async def _on_cleanup(app: web.Application):
+    """Release pooled HTTP connections and worker threads on shutdown."""
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+    await llm_close()
+    await turn_close()
+    workers.shutdown()
+
+
 def create_app() -> web.Application:
-    global INDEX_TEMPLATE, _START_TIME
+    global INDEX_TEMPLATE, INDEX_BYTES, INDEX_GZ, INDEX_HEADERS, INDEX_GZ_HEADERS
+    global INDEX_ETAG, INDEX_304_HEADERS, _START_TIME
     INDEX_TEMPLATE = build_index_html()
-    _START_TIME = time.time()
+    INDEX_BYTES = INDEX_TEMPLATE.encode("utf-8")
+    INDEX_GZ = gzip.compress(INDEX_BYTES, compresslevel=9)
+    # Weak: the gzip and identity bodies are the same resource, different bytes
+    INDEX_ETAG = 'W/"%s"' % hashlib.md5(INDEX_BYTES).hexdigest()
+    # no-cache = always revalidate, so ICE config changes show up on reload
+    INDEX_304_HEADERS = {
+        "ETag": INDEX_ETAG,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    INDEX_HEADERS = {
+        **INDEX_304_HEADERS,
+        "Content-Type": "text/html; charset=utf-8",
+        "Content-Length": str(len(INDEX_BYTES)),
+    }
+    INDEX_GZ_HEADERS = {
+        **INDEX_HEADERS,
+        "Content-Length": str(len(INDEX_GZ)),
+        "Content-Encoding": "gzip",
+    }
+    _START_TIME = time.monotonic()
 
     app = web.Application()
     app.router.add_get("/", handle_index)
@@ -525,6 +819,8 @@ def create_app() -> web.Application:
     app.router.add_get("/api/quota", handle_quota)
     app.router.add_get("/ws", handle_ws)
     app.router.add_static("/static", WEB_DIR, show_index=False)
+    app.on_startup.append(_on_startup)
+    app.on_cleanup.append(_on_cleanup)
     return app
 
 
@@ -554,6 +850,15 @@ if __name__ == "__main__":
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
     log.info("Logging to %s", log_file)
+
+    # libuv event loop: cheaper callbacks/IO for the WS + mic + RTP mix
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        log.info("Using uvloop event loop")
+    except ImportError:
+        log.info("uvloop not installed — using default asyncio event loop")
+
     app = create_app()
 
     # HTTPS mode for LAN testing (getUserMedia requires secure context)
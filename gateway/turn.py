@@ -1,42 +1,88 @@
 """Fetch ephemeral TURN credentials from Twilio NTS."""
 
+import asyncio
 import logging
 import os
+import time
 
 import aiohttp
 
 log = logging.getLogger("turn")
 
+# Credentials are shared by all connections: reuse them for half their
+# Twilio TTL, and remember a failure briefly so connects don't hammer the API
+TURN_FAILURE_TTL = 30.0  # seconds an empty result is reused
+_turn_cache: tuple[float, list] | None = None  # (expires_at, ice_servers)
+_turn_task: asyncio.Task | None = None
+
+# Shared HTTP session — reuses the TLS connection to Twilio across hellos
+_http_session: aiohttp.ClientSession | None = None
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """Create the keep-alive ClientSession on first use (needs a running loop)."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=300, ttl_dns_cache=300),
+        )
+    return _http_session
+
+
+async def close():
+    """Close the shared HTTP session (call on app shutdown)."""
+    global _http_session
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
 
 async def fetch_twilio_turn_credentials() -> list:
-    """Call Twilio's Network Traversal Service to get temporary TURN/STUN creds.
+    """Get temporary TURN/STUN creds from Twilio's Network Traversal Service.
 
     Returns a list of ICE server dicts in the format:
         [{"urls": "turn:...", "username": "...", "credential": "..."}]
 
-    Returns empty list if Twilio is not configured.
+    Returns empty list if Twilio is not configured. The result is cached
+    and concurrent callers share a single in-flight request.
     """
+    global _turn_task
+    if _turn_cache and time.monotonic() < _turn_cache[0]:
+        return _turn_cache[1]
+    if _turn_task is None or _turn_task.done():
+        _turn_task = asyncio.ensure_future(_fetch_and_cache())
+    return await asyncio.shield(_turn_task)
+
+
+async def _fetch_and_cache() -> list:
+    global _turn_cache
+    ice_servers, ttl = await _fetch_from_twilio()
+    _turn_cache = (time.monotonic() + ttl, ice_servers)
+    return ice_servers
+
+
+async def _fetch_from_twilio() -> tuple[list, float]:
+    """Call Twilio NTS once. Returns (ice_servers, seconds to cache them)."""
     account_sid = os.getenv("TWILIO_ACCOUNT_SID", "")
     auth_token = os.getenv("TWILIO_AUTH_TOKEN", "")
 
     if not account_sid or not auth_token:
         log.warning("TWILIO_ACCOUNT_SID / TWILIO_AUTH_TOKEN not set — no TURN servers")
-        return []
+        return [], TURN_FAILURE_TTL
 
     url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Tokens.json"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                auth=aiohttp.BasicAuth(account_sid, auth_token),
-            ) as resp:
-                if resp.status != 201:
-                    body = await resp.text()
-                    log.error("Twilio token request failed (%d): %s", resp.status, body)
-                    return []
-
-                data = await resp.json()
+        async with _get_http_session().post(
+            url,
+            auth=aiohttp.BasicAuth(account_sid, auth_token),
+        ) as resp:
+            if resp.status != 201:
+                body = await resp.text()
+                log.error("Twilio token request failed (%d): %s", resp.status, body)
+                return [], TURN_FAILURE_TTL
+
+            data = await resp.json()
 
         ice_servers = data.get("ice_servers", [])
         log.info(
@@ -44,8 +90,9 @@ async def fetch_twilio_turn_credentials() -> list:
             len(ice_servers),
             data.get("ttl", "?"),
         )
-        return ice_servers
+        ttl = float(data.get("ttl") or 0) / 2 if ice_servers else TURN_FAILURE_TTL
+        return ice_servers, ttl
 
     except Exception as e:
         log.error("Failed to fetch Twilio TURN credentials: %s", e)
-        return []
+        return [], TURN_FAILURE_TTL
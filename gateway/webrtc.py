@@ -1,8 +1,10 @@
 """WebRTC session management — PeerConnection lifecycle and ICE config."""
 
 import asyncio
-import json
+import functools
+import hashlib
 import logging
+import math
 import os
 import re
 
@@ -10,29 +12,82 @@ import numpy as np
 from aiortc import RTCPeerConnection, RTCSessionDescription, RTCConfiguration, RTCIceServer
 
 from engine.adapter import create_generator
+from engine.resample import StreamResampler
 from engine.types import AudioChunk
 from gateway.audio.audio_queue import AudioQueue
 from gateway.audio.webrtc_audio_source import WebRTCAudioSource
+from gateway.workers import STT_POOL, TTS_POOL
 
 FRAME_SAMPLES = 960  # 20ms at 48kHz
 SAMPLE_RATE = 48000
+MIC_RATE = 16000  # Mic audio is buffered at Whisper's rate, resampled once at ingest
+MIC_BUFFER_SECONDS = 30  # Initial mic buffer size; doubles if a recording runs longer
+STT_STEP_SECONDS = 1.0  # New audio that triggers another incremental transcription
+STT_COMMIT_MARGIN = 2.0  # Segments ending this far before the live edge are final
+STT_SILENCE_PEAK = 300  # int16 peak (~-40 dBFS) below which new mic audio counts as silence
+TTS_LOOKAHEAD = 1  # Later sentences synthesized ahead while the current one streams
+
+# av sample format → numpy dtype of one sample, for reading frame planes directly
+_MIC_DTYPES = {
+    "s16": np.int16, "s16p": np.int16,
+    "flt": np.float32, "fltp": np.float32,
+    "dbl": np.float64, "dblp": np.float64,
+}
+
+# (format name, layout name) → (dtype or None, channels, planar), filled per
+# new format. A mic track keeps one format, so each frame costs a dict hit
+# instead of walking frame.format / frame.layout objects.
+_MIC_PLANS: dict[tuple[str, str], tuple] = {}
 
 log = logging.getLogger("webrtc")
 
+# Sentence boundary: sentence-ending punctuation followed by whitespace
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
 
-def ice_servers_to_rtc(servers: list) -> list:
-    """Convert ICE server dicts to RTCIceServer objects."""
-    result = []
+# DTLS certificate fingerprint lines — stable for the life of a browser
+# RTCPeerConnection, so they identify which peer an offer comes from
+_FINGERPRINT_RE = re.compile(r'^a=fingerprint:(.+?)\s*$', re.MULTILINE)
+
+
+def _ice_key(servers: list) -> tuple:
+    """Hashable (urls, username, credential) form of ICE server dicts."""
+    key = []
     for s in servers:
         urls = s.get("urls", s.get("url", ""))
         if isinstance(urls, str):
             urls = [urls]
-        result.append(RTCIceServer(
-            urls=urls,
-            username=s.get("username", ""),
-            credential=s.get("credential", ""),
-        ))
-    return result
+        key.append((tuple(urls), s.get("username", ""), s.get("credential", "")))
+    return tuple(key)
+
+
+@functools.lru_cache(maxsize=4)
+def _build_rtc_servers(key: tuple) -> tuple:
+    return tuple(
+        RTCIceServer(urls=list(urls), username=username, credential=credential)
+        for urls, username, credential in key
+    )
+
+
+def ice_servers_to_rtc(servers: list) -> list:
+    """Convert ICE server dicts to RTCIceServer objects.
+
+    Memoized on the server list's contents — reconnects within a TURN
+    credential window reuse the same objects.
+    """
+    return list(_build_rtc_servers(_ice_key(servers)))
+
+
+# Peer connection state loggers, shared by every Session (bound per pc)
+def _log_connection_state(pc):
+    log.info("Connection state: %s", pc.connectionState)
+
+
+def _log_ice_state(pc):
+    log.info("ICE connection state: %s", pc.iceConnectionState)
+
+
+def _log_ice_gathering(pc):
+    log.info("ICE gathering state: %s", pc.iceGatheringState)
 
 
 class QueuedGenerator:
@@ -44,11 +99,16 @@ class QueuedGenerator:
 
     def __init__(self, queue: AudioQueue):
         self.queue = queue
+        self._frame = bytearray(FRAME_SAMPLES * 2)  # 2 bytes per int16 sample, reused
 
     def next_chunk(self) -> AudioChunk:
-        """Read one 20ms frame (960 samples = 1920 bytes) from the queue."""
-        pcm = self.queue.read(FRAME_SAMPLES * 2)  # 2 bytes per int16 sample
-        return AudioChunk(samples=pcm, sample_rate=SAMPLE_RATE, channels=1)
+        """Read one 20ms frame (960 samples = 1920 bytes) from the queue.
+
+        The samples buffer is reused — it's only valid until the next call
+        (WebRTCAudioSource copies it into an AudioFrame straight away).
+        """
+        self.queue.read_into(self._frame)
+        return AudioChunk(samples=self._frame, sample_rate=SAMPLE_RATE, channels=1)
 
 
 class Session:
@@ -58,51 +118,71 @@ class Session:
         rtc_servers = ice_servers_to_rtc(ice_servers or [])
         config = RTCConfiguration(iceServers=rtc_servers) if rtc_servers else RTCConfiguration()
         self._pc = RTCPeerConnection(configuration=config)
+        self._loop = asyncio.get_running_loop()  # Sessions are created inside the WS handler
         self._audio_source = WebRTCAudioSource()
         self._generator = None
+        self._offer_digest = None  # sha256 of the last offer SDP
+        self._remote_fingerprint = None  # DTLS fingerprints of the connected peer
 
-        # FIFO audio queue for TTS — never drops audio, drains sentence by sentence
+        # FIFO audio queue for TTS — never drops audio, drains sentence by sentence.
+        # One queue/generator pair per session: stop_speaking() clears the
+        # queue rather than replacing it, so the generator stays valid.
         self._audio_queue = AudioQueue()
         self._tts_generator = QueuedGenerator(self._audio_queue)
+        self._speak_epoch = 0  # Bumped by stop_speaking() so in-flight speak_text() stops
 
         # Mic recording state
         self._recording = False
-        self._mic_frames: list[bytes] = []
+        self._mic_buf = np.empty(MIC_RATE * MIC_BUFFER_SECONDS, dtype=np.int16)
+        self._mic_pos = 0  # Samples recorded into _mic_buf
+        self._mic_scratch = np.empty(FRAME_SAMPLES, dtype=np.float32)  # Mono downmix staging
+        self._mic_resampler: StreamResampler | None = None  # Frame rate → MIC_RATE, per recording
+        self._mic_in_rate = 0
         self._mic_track = None
         self._mic_recv_task: asyncio.Task | None = None
         self._transcribe_task: asyncio.Task | None = None
         self._on_transcription = None  # callback for partial results
-        self._transcribe_interval = 5  # seconds between partial transcriptions
+        # Incremental STT: text before _stt_committed (a sample index) is final
+        self._stt_text: list[str] = []
+        self._stt_committed = 0
+        self._stt_scheduled = 0  # _mic_pos when the pump last took a snapshot
+        self._stt_ready = asyncio.Event()  # Set once STT_STEP_SECONDS of new audio arrive
 
         # Log state changes
-        @self._pc.on("connectionstatechange")
-        async def on_conn_state():
-            log.info("Connection state: %s", self._pc.connectionState)
-
-        @self._pc.on("iceconnectionstatechange")
-        async def on_ice_state():
-            log.info("ICE connection state: %s", self._pc.iceConnectionState)
-
-        @self._pc.on("icegatheringstatechange")
-        async def on_ice_gather():
-            log.info("ICE gathering state: %s", self._pc.iceGatheringState)
-
-        @self._pc.on("track")
-        async def on_track(track):
-            if track.kind != "audio":
-                return
-            log.info("Received remote audio track from browser mic")
-            self._mic_track = track
-            self._mic_recv_task = asyncio.ensure_future(self._recv_mic_audio(track))
+        self._pc.on("connectionstatechange", functools.partial(_log_connection_state, self._pc))
+        self._pc.on("iceconnectionstatechange", functools.partial(_log_ice_state, self._pc))
+        self._pc.on("icegatheringstatechange", functools.partial(_log_ice_gathering, self._pc))
+        self._pc.on("track", self._on_track)
+
+    def _on_track(self, track):
+        if track.kind != "audio":
+            return
+        log.info("Received remote audio track from browser mic")
+        self._mic_track = track
+        self._mic_recv_task = asyncio.ensure_future(self._recv_mic_audio(track))
+
+    def accepts_offer(self, sdp: str) -> bool:
+        """True if sdp comes from the peer this session is already negotiated with."""
+        return (self._remote_fingerprint is not None
+                and self._pc.connectionState not in ("failed", "closed")
+                and tuple(_FINGERPRINT_RE.findall(sdp)) == self._remote_fingerprint)
 
     async def handle_offer(self, sdp: str) -> str:
         """Process client SDP offer, return SDP answer.
 
         aiortc bundles all ICE candidates into the answer SDP
-        automatically (no trickle ICE support).
+        automatically (no trickle ICE support). A later offer from the
+        same peer renegotiates on the existing connection; a byte-identical
+        resend just gets the previous answer back.
         """
-        # Add our audio track to the connection
-        self._pc.addTrack(self._audio_source)
+        digest = hashlib.sha256(sdp.encode()).digest()
+        if digest == self._offer_digest:
+            log.info("Offer unchanged — reusing SDP answer")
+            return self._pc.localDescription.sdp
+
+        # Add our audio track to the connection (once — renegotiation keeps it)
+        if self._offer_digest is None:
+            self._pc.addTrack(self._audio_source)
 
         # Set the remote offer
         offer = RTCSessionDescription(sdp=sdp, type="offer")
@@ -112,6 +192,8 @@ class Session:
         answer = await self._pc.createAnswer()
         await self._pc.setLocalDescription(answer)
 
+        self._offer_digest = digest
+        self._remote_fingerprint = tuple(_FINGERPRINT_RE.findall(sdp))
         log.info("SDP answer created")
         return self._pc.localDescription.sdp
 
@@ -129,6 +211,7 @@ class Session:
 
     def stop_speaking(self):
         """Stop TTS playback — clear the audio queue and detach generator."""
+        self._speak_epoch += 1
         self._audio_queue.clear()
         self._audio_source.clear_generator()
         log.info("TTS playback stopped, queue cleared")
@@ -136,32 +219,116 @@ class Session:
     @staticmethod
     def _split_sentences(text: str) -> list[str]:
         """Split text into sentences for incremental TTS."""
-        # Split on sentence-ending punctuation followed by whitespace
-        parts = re.split(r'(?<=[.!?])\s+', text.strip())
+        parts = _SENTENCE_END_RE.split(text.strip())
         return [p for p in parts if p.strip()]
 
-    async def speak_text(self, text: str, voice_id: str = ""):
+    async def speak_text(self, text: str, voice_id: str = "", epoch: int | None = None):
         """Run TTS sentence-by-sentence and enqueue audio into the FIFO.
 
-        Each sentence is synthesized in a thread, then enqueued immediately.
-        The WebRTC track starts playing the first sentence while later
-        sentences are still being synthesized.
+        Each sentence is synthesized in a thread that streams 20ms frames
+        straight into the (thread-safe) queue as Piper produces them, so
+        the WebRTC track starts playing before the sentence is finished.
+        Meanwhile the next TTS_LOOKAHEAD sentences are synthesized into
+        buffers on the other TTS workers, then enqueued in order.
+
+        epoch is the caller's _speak_epoch snapshot; if stop_speaking() has
+        run since, nothing is spoken (and the generator isn't re-attached).
         """
-        from engine.tts import synthesize
+        from engine.tts import synthesize_stream
 
-        # Ensure the TTS generator is attached to the audio source
-        self._audio_source.set_generator(self._tts_generator)
+        if epoch is None:
+            epoch = self._speak_epoch
+        elif epoch != self._speak_epoch:
+            return
+
+        # Attach the TTS generator unless it already is (multi-sentence and
+        # multi-turn replies call this back to back)
+        if self._audio_source.generator is not self._tts_generator:
+            self._audio_source.set_generator(self._tts_generator)
 
         sentences = self._split_sentences(text)
         log.info("TTS: %d sentences to synthesize", len(sentences))
 
-        loop = asyncio.get_event_loop()
-        for i, sentence in enumerate(sentences):
-            pcm_48k = await loop.run_in_executor(None, synthesize, sentence, voice_id)
-            if pcm_48k:
-                self._audio_queue.enqueue(pcm_48k)
-                log.debug("TTS sentence %d/%d enqueued: %d bytes — %r",
-                          i + 1, len(sentences), len(pcm_48k), sentence[:60])
+        def _synthesize_into_queue(sentence: str) -> int:
+            total = 0
+            for frame in synthesize_stream(sentence, voice_id):
+                if epoch != self._speak_epoch:
+                    break  # stop_speaking() cleared the queue — don't refill it
+                self._audio_queue.enqueue(frame)
+                total += len(frame)
+            return total
+
+        def _synthesize_frames(sentence: str) -> list:
+            return list(synthesize_stream(sentence, voice_id))
+
+        loop = self._loop
+        ahead: dict[int, asyncio.Future] = {}  # sentence index → buffered frames
+        try:
+            for i, sentence in enumerate(sentences):
+                # Submit the current sentence before any lookahead so it gets a worker first
+                buffered = ahead.pop(i, None)
+                current = buffered or loop.run_in_executor(TTS_POOL, _synthesize_into_queue, sentence)
+                for j in range(i + 1, min(i + 1 + TTS_LOOKAHEAD, len(sentences))):
+                    if j not in ahead:
+                        ahead[j] = loop.run_in_executor(TTS_POOL, _synthesize_frames, sentences[j])
+
+                result = await current
+                if epoch != self._speak_epoch:
+                    break  # stop_speaking() — drop the rest
+                if buffered is not None:
+                    for frame in result:
+                        self._audio_queue.enqueue(frame)
+                    result = sum(len(frame) for frame in result)
+                if result:
+                    log.debug("TTS sentence %d/%d enqueued: %d bytes — %r",
+                              i + 1, len(sentences), result, sentence[:60])
+        finally:
+            for fut in ahead.values():
+                fut.cancel()  # Only stops jobs that haven't started
+
+    async def speak_stream(self, deltas, voice_id: str = "") -> str:
+        """Speak a reply while it is still streaming in from the LLM.
+
+        Complete sentences are split off the incoming text and handed, in
+        order, to a background task that synthesizes them — so TTS of one
+        sentence overlaps generation of the next. Returns the full text, or
+        the text received so far if stop_speaking() cut the reply short.
+        """
+        sentences: asyncio.Queue = asyncio.Queue()
+        epoch = self._speak_epoch
+
+        async def _speaker():
+            while (sentence := await sentences.get()) is not None:
+                await self.speak_text(sentence, voice_id=voice_id, epoch=epoch)
+
+        speaker = asyncio.ensure_future(_speaker())
+        parts = []
+        pending = ""
+        try:
+            async for delta in deltas:
+                if epoch != self._speak_epoch:
+                    # stop_speaking() — drop queued sentences and stop the LLM stream
+                    while not sentences.empty():
+                        sentences.get_nowait()
+                    pending = ""
+                    break
+                parts.append(delta)
+                pending += delta
+                *complete, pending = _SENTENCE_END_RE.split(pending)
+                for sentence in complete:
+                    if sentence.strip():
+                        sentences.put_nowait(sentence)
+            if pending.strip():
+                sentences.put_nowait(pending)
+        except asyncio.CancelledError:
+            speaker.cancel()  # Turn abandoned — don't speak what's still queued
+            raise
+        finally:
+            await deltas.aclose()  # Ends the LLM request early; no-op once exhausted
+            if not speaker.cancelled():
+                sentences.put_nowait(None)
+                await speaker
+        return "".join(parts)
 
     async def _recv_mic_audio(self, track):
         """Background task: continuously receive audio frames from the browser mic track."""
@@ -174,87 +341,204 @@ class Session:
                 break
 
             if not logged_format:
-                arr = frame.to_ndarray()
                 log.info(
-                    "Mic frame format=%s rate=%d samples=%d shape=%s dtype=%s range=[%s, %s]",
-                    frame.format.name, frame.sample_rate, frame.samples,
-                    arr.shape, arr.dtype, arr.min(), arr.max(),
+                    "Mic frame format=%s layout=%s rate=%d samples=%d",
+                    frame.format.name, frame.layout.name, frame.sample_rate, frame.samples,
                 )
+                if log.isEnabledFor(logging.DEBUG):
+                    # Decoding a full ndarray just for its range — debug only
+                    arr = frame.to_ndarray()
+                    log.debug("Mic frame shape=%s dtype=%s range=[%s, %s]",
+                              arr.shape, arr.dtype, arr.min(), arr.max())
                 logged_format = True
 
             if self._recording:
-                arr = frame.to_ndarray()
-                # Handle float formats (fltp/flt) — scale to int16
-                if arr.dtype in (np.float32, np.float64):
-                    arr = (arr * 32767).clip(-32768, 32767).astype(np.int16)
-                # s16 interleaved stereo: shape=(1, samples*channels) — take every other sample for mono
-                flat = arr.flatten()
-                channels = flat.shape[0] // frame.samples
-                if channels > 1:
-                    flat = flat[::channels]  # take left channel
-                pcm = flat.astype(np.int16).tobytes()
-                self._mic_frames.append(pcm)
+                self._append_mic_frame(frame)
+                if self._mic_pos - self._stt_scheduled >= STT_STEP_SECONDS * MIC_RATE:
+                    self._stt_ready.set()
+
+    def _mic_reserve(self, n: int) -> np.ndarray:
+        """Return a writable view for the next n mic samples, growing the buffer if full."""
+        pos = self._mic_pos
+        if pos + n > len(self._mic_buf):
+            grown = np.empty(max(2 * len(self._mic_buf), pos + n), dtype=np.int16)
+            grown[:pos] = self._mic_buf[:pos]
+            self._mic_buf = grown
+        self._mic_pos = pos + n
+        return self._mic_buf[pos:pos + n]
+
+    def _scratch(self, name: str, n: int, dtype) -> np.ndarray:
+        """Reusable n-sample staging array (grown on demand)."""
+        buf = getattr(self, name)
+        if len(buf) < n:
+            buf = np.empty(n, dtype=dtype)
+            setattr(self, name, buf)
+        return buf[:n]
+
+    def _append_mic_frame(self, frame):
+        """Downmix one frame to mono (L/2 + R/2) and buffer it as int16 at MIC_RATE."""
+        n = frame.samples
+        fmt = frame.format
+        key = (fmt.name, frame.layout.name)
+        plan = _MIC_PLANS.get(key)
+        if plan is None:
+            plan = _MIC_PLANS[key] = (_MIC_DTYPES.get(key[0]), len(frame.layout.channels), fmt.is_planar)
+        dtype, channels, planar = plan
+
+        # Mono at int16 scale, in float32 — the resampler's working type
+        tmp = self._scratch("_mic_scratch", n, np.float32)
+        if dtype is None:
+            self._mono_generic(frame, n, tmp)
+        else:
+            if planar:
+                chans = [np.frombuffer(frame.planes[i], dtype=dtype, count=n)
+                         for i in range(min(channels, 2))]
+            else:
+                # Interleaved: (n, channels) view over the plane — strided, no copy
+                inter = np.frombuffer(frame.planes[0], dtype=dtype, count=n * channels).reshape(n, channels)
+                chans = [inter[:, 0], inter[:, 1]] if channels > 1 else [inter[:, 0]]
+            scale = 1 if dtype is np.int16 else 32767
+            if len(chans) == 1:
+                np.multiply(chans[0], scale, out=tmp, dtype=np.float32)
+            else:
+                # Summed in float32, so int16 input can't overflow
+                np.add(chans[0], chans[1], out=tmp, dtype=np.float32)
+                tmp *= scale / 2
+
+        resampler = self._mic_resampler
+        if resampler is None or frame.sample_rate != self._mic_in_rate:
+            resampler = self._new_mic_resampler(frame.sample_rate)
+        self._store_mic(resampler.feed(tmp))
+
+    def _new_mic_resampler(self, rate: int) -> StreamResampler:
+        if self._mic_resampler is not None:
+            self._store_mic(self._mic_resampler.flush())  # Rate changed mid-recording
+        g = math.gcd(MIC_RATE, rate)
+        self._mic_resampler = StreamResampler(MIC_RATE // g, rate // g)
+        self._mic_in_rate = rate
+        return self._mic_resampler
+
+    def _store_mic(self, samples: np.ndarray):
+        """Clip and round int16-scaled float32 samples onto the end of the mic buffer."""
+        if not len(samples):
+            return
+        np.clip(samples, -32768, 32767, out=samples)
+        np.rint(samples, out=samples)
+        np.copyto(self._mic_reserve(len(samples)), samples, casting="unsafe")
+
+    @staticmethod
+    def _mono_generic(frame, n: int, tmp: np.ndarray):
+        """Fallback for formats without a direct plane read: first channel only."""
+        arr = frame.to_ndarray()
+        # Planar → (channels, n); packed → (1, n * channels). Stride over the
+        # 2-D view for channel 0 rather than flattening a copy.
+        chan = arr[0, :n] if arr.shape[0] > 1 else arr[0, ::arr.shape[1] // n]
+        kind, size = chan.dtype.kind, chan.dtype.itemsize
+        if kind == "f":
+            np.multiply(chan, 32767, out=tmp, dtype=np.float32, casting="unsafe")
+        elif kind == "u":
+            # Unsigned (u8): recentre on zero, then scale to 16 bits
+            np.subtract(chan, 1 << (8 * size - 1), out=tmp, dtype=np.float32)
+            tmp *= 1 << (16 - 8 * size)
+        else:
+            # Signed ints (s16 / s32): scale to 16 bits
+            np.multiply(chan, 2.0 ** (16 - 8 * size), out=tmp, dtype=np.float32, casting="unsafe")
 
     def start_recording(self, on_transcription=None):
         """Start buffering incoming mic audio frames.
 
         Args:
             on_transcription: async callback(text, partial) called with
-                              partial transcriptions every TRANSCRIBE_INTERVAL seconds.
+                              partial transcriptions as audio arrives.
         """
-        self._mic_frames.clear()
+        self._mic_pos = 0
+        self._mic_resampler = None
+        if len(self._mic_buf) > MIC_RATE * MIC_BUFFER_SECONDS:
+            # A long recording grew the buffer — don't keep it for every later one
+            self._mic_buf = np.empty(MIC_RATE * MIC_BUFFER_SECONDS, dtype=np.int16)
+        self._stt_text = []
+        self._stt_committed = 0
+        self._stt_scheduled = 0
+        self._stt_ready.clear()
         self._recording = True
         self._on_transcription = on_transcription
-        self._transcribe_task = asyncio.ensure_future(self._periodic_transcribe())
+        self._transcribe_task = asyncio.ensure_future(self._stt_pump())
         log.info("Mic recording started (live transcription enabled)")
 
-    async def _periodic_transcribe(self):
-        """Background task: transcribe accumulated audio every N seconds."""
-        from engine.stt import transcribe
+    async def _stt_pump(self):
+        """Background task: transcribe the uncommitted tail as audio arrives.
+
+        Each pass covers audio from _stt_committed to the live edge. Segments
+        that end STT_COMMIT_MARGIN before the edge won't change with more
+        audio, so their text is committed and later passes (and the final
+        transcription in stop_recording) start after them.
+        """
+        from engine.stt import transcribe_segments
 
-        interval = self._transcribe_interval
-        loop = asyncio.get_event_loop()
+        loop = self._loop
 
         while self._recording:
-            await asyncio.sleep(interval)
+            await self._stt_ready.wait()
+            self._stt_ready.clear()
             if not self._recording:
                 break
-            if not self._mic_frames:
-                continue
 
-            # Snapshot all audio accumulated so far (don't clear — rolling full)
-            pcm_data = b"".join(self._mic_frames)
-            log.debug("Partial transcription: %d frames, %d bytes", len(self._mic_frames), len(pcm_data))
-
-            text = await loop.run_in_executor(None, transcribe, pcm_data, SAMPLE_RATE)
-
-            if text and self._on_transcription and self._recording:
-                await self._on_transcription(text, True)
+            start, end = self._stt_committed, self._mic_pos
+            new_audio = self._mic_buf[self._stt_scheduled:end]
+            self._stt_scheduled = end
+            if len(new_audio) and max(new_audio.max(), -int(new_audio.min())) < STT_SILENCE_PEAK:
+                # Nothing new to hear — the last partial still stands
+                log.debug("Skipping incremental transcription: %d silent samples", len(new_audio))
+                continue
+            # A view: appends only land past `end`, so the slice is stable while STT reads it
+            pcm_data = self._mic_buf[start:end]
+            log.debug("Incremental transcription: %d samples from %d", end - start, start)
+
+            segments = await loop.run_in_executor(STT_POOL, transcribe_segments, pcm_data, MIC_RATE)
+
+            window = (end - start) / MIC_RATE
+            hypothesis = []
+            for seg_start, seg_end, text in segments:
+                if not hypothesis and seg_end < window - STT_COMMIT_MARGIN:
+                    if text:
+                        self._stt_text.append(text)
+                    self._stt_committed = start + int(seg_end * MIC_RATE)
+                elif text:
+                    hypothesis.append(text)
+
+            partial = " ".join(self._stt_text + hypothesis)
+            if partial and self._on_transcription and self._recording:
+                await self._on_transcription(partial, True)
 
     async def stop_recording(self) -> str:
-        """Stop recording, cancel periodic task, do final transcription."""
+        """Stop recording, cancel the STT pump, transcribe the uncommitted tail."""
         self._recording = False
 
-        # Cancel periodic transcription
+        # Cancel incremental transcription (its committed text is kept)
         if self._transcribe_task:
             self._transcribe_task.cancel()
             self._transcribe_task = None
 
-        if not self._mic_frames:
+        if self._mic_resampler is not None:
+            self._store_mic(self._mic_resampler.flush())  # Filter tail of the last frames
+            self._mic_resampler = None
+
+        if not self._mic_pos:
             log.warning("No mic frames captured")
             return ""
 
-        # Final transcription of all audio
-        pcm_data = b"".join(self._mic_frames)
-        num_frames = len(self._mic_frames)
-        self._mic_frames.clear()
+        # Final transcription of whatever the pump hasn't committed yet
+        pcm_data = self._mic_buf[self._stt_committed:self._mic_pos]
+        num_samples = self._mic_pos
+        committed = self._stt_text
+        self._mic_pos = 0
 
-        log.info("Mic recording stopped: %d frames, %d bytes", num_frames, len(pcm_data))
+        log.info("Mic recording stopped: %d samples, %d committed, %d bytes to transcribe",
+                 num_samples, self._stt_committed, pcm_data.nbytes)
 
         from engine.stt import transcribe
-        loop = asyncio.get_event_loop()
-        text = await loop.run_in_executor(None, transcribe, pcm_data, SAMPLE_RATE)
-        return text
+        tail = await self._loop.run_in_executor(STT_POOL, transcribe, pcm_data, MIC_RATE)
+        return " ".join(committed + [tail]).strip() if tail else " ".join(committed)
 
     async def close(self):
         """Tear down the peer connection."""
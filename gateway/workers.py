@@ -0,0 +1,25 @@
+"""Dedicated thread pools for speech synthesis and recognition.
+
+TTS and STT both block on CPU-bound model calls. Giving each its own
+pool keeps a long Whisper pass from queueing ahead of the next TTS
+sentence (and vice versa) in the loop's shared default executor.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# TTS: up to two workers — enough to synthesize one sentence ahead without
+# oversubscribing the cores onnxruntime already parallelizes across.
+# STT: one worker — Whisper passes are long and CTranslate2 runs one at a
+# time per model anyway, so extra threads would only hold more audio.
+TTS_WORKERS = int(os.getenv("TTS_WORKERS") or 0) or max(1, min(2, (os.cpu_count() or 1) // 2))
+STT_WORKERS = int(os.getenv("STT_WORKERS") or 1)
+
+TTS_POOL = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+STT_POOL = ThreadPoolExecutor(max_workers=STT_WORKERS, thread_name_prefix="stt")
+
+
+def shutdown():
+    """Stop both pools (call on app shutdown)."""
+    TTS_POOL.shutdown(wait=False, cancel_futures=True)
+    STT_POOL.shutdown(wait=False, cancel_futures=True)
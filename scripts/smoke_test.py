@@ -7,6 +7,9 @@ Tests each layer without needing a browser or WebRTC connection:
   3. BufferedGenerator        → 20ms chunk framing
   4. WAV output               → saves to logs/smoke_test.wav
   5. engine/stt.transcribe()  → STT round-trip (TTS → STT)
+  6. StreamResampler          → chunked output matches resample_poly
+  7. AudioQueue.read_into()   → matches read() across chunk boundaries
+  8. Text tool-call scanner   → `name {json}` parsing
 
 Usage:
     python3 scripts/smoke_test.py
@@ -204,6 +207,98 @@ def test_stt_empty():
         report("STT empty input", False, str(e))
 
 
+def test_stream_resampler():
+    """Test 6: chunked StreamResampler output matches one-shot resample_poly."""
+    print("\n--- Test 6: StreamResampler ---")
+    try:
+        import numpy as np
+        from scipy.signal import resample_poly
+        from engine.resample import StreamResampler
+
+        rng = np.random.default_rng(0)
+        signal = (rng.standard_normal(22050) * 8000).astype(np.float32)
+        for label, up, down in (("48k->16k", 1, 3), ("22.05k->48k", 320, 147)):
+            expected = resample_poly(signal, up, down)
+            rs = StreamResampler(up, down)
+            # Uneven chunk sizes, like real mic/TTS frames
+            parts = []
+            pos = 0
+            for n in (1, 7, 480, 960, 1234, 4096) * 3:
+                parts.append(rs.feed(signal[pos:pos + n]))
+                pos += n
+            parts.append(rs.feed(signal[pos:]))
+            parts.append(rs.flush())
+            got = np.concatenate(parts)
+            report(f"{label} length matches", len(got) == len(expected),
+                   f"{len(got)} vs {len(expected)}")
+            err = float(np.max(np.abs(got[:len(expected)] - expected[:len(got)])))
+            report(f"{label} samples match", err < 1.0, f"max err={err:.4f}")
+
+    except Exception as e:
+        report("StreamResampler tests complete", False, str(e))
+
+
+def test_audio_queue_read_into():
+    """Test 7: AudioQueue.read_into() matches read() across chunk boundaries."""
+    print("\n--- Test 7: AudioQueue.read_into ---")
+    try:
+        from gateway.audio.audio_queue import AudioQueue
+
+        blobs = [bytes(range(1, 200)), b"\x7f" * 1000, bytes(range(50, 250)) * 3]
+        a, b = AudioQueue(), AudioQueue()
+        for blob in blobs:
+            a.enqueue(blob)
+            b.enqueue(blob)
+        total = a.available
+
+        out = bytearray(BYTES_PER_FRAME // 4)  # Frames straddle every blob boundary
+        same = True
+        written_total = 0
+        for _ in range(-(-total // len(out)) + 1):  # One extra read of pure silence
+            written = a.read_into(out)
+            written_total += written
+            same = same and bytes(out) == b.read(len(out))
+        report("read_into matches read", same)
+        report("read_into counts queued bytes", written_total == total,
+               f"{written_total} vs {total}")
+
+        # Short read: remainder is zero-padded, even over stale buffer contents
+        a.enqueue(b"\x01\x02\x03")
+        out[:] = b"\xff" * len(out)
+        written = a.read_into(out)
+        report("read_into zero-pads when short",
+               written == 3 and bytes(out) == b"\x01\x02\x03" + b"\x00" * (len(out) - 3))
+
+    except Exception as e:
+        report("AudioQueue.read_into tests complete", False, str(e))
+
+
+def test_text_tool_call_scanner():
+    """Test 8: tool calls emitted as text are found and parsed."""
+    print("\n--- Test 8: Text tool-call scanner ---")
+    try:
+        from voice_assistant.orchestrator import _scan_text_tool_calls
+
+        calls = list(_scan_text_tool_calls(
+            'gc_search {"query": "weather", "opts": {"units": {"temp": "F"}}}'))
+        report("nested JSON arguments parse",
+               calls == [("gc_search", {"query": "weather", "opts": {"units": {"temp": "F"}}})],
+               repr(calls))
+
+        calls = list(_scan_text_tool_calls('Sure. web_search({"query": "news"}) done'))
+        report("call syntax parses", calls == [("web_search", {"query": "news"})], repr(calls))
+
+        calls = list(_scan_text_tool_calls(
+            'foo.search {"query": "a"} x-notes{"query": "b"} {"query": "c"}'))
+        report("identifiers glued to other text are skipped", calls == [], repr(calls))
+
+        calls = list(_scan_text_tool_calls('search {"query": "a"'))
+        report("unterminated JSON is skipped", calls == [], repr(calls))
+
+    except Exception as e:
+        report("Text tool-call scanner tests complete", False, str(e))
+
+
 def main():
     global passed, failed
     print("=" * 50)
@@ -236,6 +331,11 @@ def main():
     # Test 5b: STT empty input (independent)
     test_stt_empty()
 
+    # Tests 6-8: streaming/parsing helpers (independent of models)
+    test_stream_resampler()
+    test_audio_queue_read_into()
+    test_text_tool_call_scanner()
+
     # Summary
     total = passed + failed
     print("\n" + "=" * 50)
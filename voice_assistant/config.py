@@ -27,6 +27,8 @@ class Settings(BaseSettings):
     # Timeouts (seconds)
     ollama_timeout: float = 60.0
     search_timeout: float = 10.0
+    search_hedge_delay: float = 0.25  # Head start for the preferred provider before fallbacks race it
+    search_cache_ttl: float = 300.0  # How long a search result is reused for the same query
 
     model_config = {
         "env_file": str(Path(__file__).resolve().parent.parent / ".env"),
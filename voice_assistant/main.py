@@ -132,6 +132,12 @@ def main() -> None:
     args = parser.parse_args()
 
     _setup_logging(args.debug)
+    # libuv event loop when available — cheaper callbacks for the streaming HTTP I/O
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(_run_repl())
 
 
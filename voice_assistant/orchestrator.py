@@ -16,14 +16,16 @@ import json
 import logging
 import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Optional
 
 import httpx
+import orjson
 
 from .config import settings
 from .tool_router import dispatch_tool_call
-from .tools import get_all_schemas
+from .tools import close_all as close_tools, get_all_schemas
 
 log = logging.getLogger("orchestrator")
 
@@ -31,15 +33,31 @@ log = logging.getLogger("orchestrator")
 _PROMPT_PATH = Path(__file__).parent / "prompts" / "system.txt"
 _SYSTEM_TEMPLATE = _PROMPT_PATH.read_text()
 
+
+@lru_cache(maxsize=4)
+def _format_system_prompt(date: str, time: str) -> str:
+    """Fill in the template; turns within the same minute share the result."""
+    return _SYSTEM_TEMPLATE.format(date=date, time=time)
+
+
+# The <think> pattern runs over raw model output, so use google-re2 when
+# installed: linear-time DFA matching, so an unclosed <think> in a long
+# reply can't make the lazy scan quadratic. The flag is inline so both
+# engines accept it.
+try:
+    import re2 as _output_re
+except ImportError:
+    _output_re = re
+
 # Regex to strip <think>...</think> blocks from Qwen 3 output
-_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+_THINK_RE = _output_re.compile(r"(?s)<think>.*?</think>")
+
+# Decoder for tool-call arguments found in text; raw_decode() both finds
+# where a (possibly nested) JSON object ends and parses it in one pass.
+_JSON_DECODER = json.JSONDecoder()
 
-# Regex to detect tool calls emitted as text (fallback for models without native support).
-# Matches patterns like: tool_name {"key": "val"}  or  tool_name({"key": "val"})
-_TEXT_TOOL_RE = re.compile(
-    r"""(?:^|['"`\s])(\w+)\s*\(?\s*(\{[^}]*\})\s*\)?""",
-    re.DOTALL,
-)
+# Characters that may precede a tool name emitted as text (or start of text)
+_TOOL_NAME_BOUNDARY = frozenset("'\"` \t\n\r\f\v")
 
 # Map model-emitted tool names to our registry names.
 # Models like qwen2.5 invent their own names (gc_search, etc.)
@@ -56,18 +74,60 @@ _TOOL_ALIASES: dict[str, str] = {
 }
 
 
+def _scan_text_tool_calls(text: str):
+    """Yield (name, args) for each `name {json}` or `name({json})` in text.
+
+    Walks the text once: from each "{" it steps back over whitespace and
+    an optional "(" to the preceding identifier, then lets raw_decode()
+    consume the object — so nested arguments like {"a": {"b": 1}} parse.
+    """
+    i = 0
+    while (brace := text.find("{", i)) >= 0:
+        k = brace - 1
+        while k >= 0 and text[k].isspace():
+            k -= 1
+        if k >= 0 and text[k] == "(":
+            k -= 1
+            while k >= 0 and text[k].isspace():
+                k -= 1
+        end = k + 1
+        while k >= 0 and (text[k].isalnum() or text[k] == "_"):
+            k -= 1
+        if end == k + 1 or (k >= 0 and text[k] not in _TOOL_NAME_BOUNDARY):
+            i = brace + 1  # No identifier, or one glued to other text
+            continue
+        try:
+            args, i = _JSON_DECODER.raw_decode(text, brace)
+        except ValueError:
+            i = brace + 1
+            continue
+        if isinstance(args, dict):
+            yield text[k + 1:end], args
+
+
 class Orchestrator:
     """Manages conversation state and Ollama tool-calling loop."""
 
     def __init__(self) -> None:
-        self.messages: list[dict] = []
+        # System prompt at slot 0, then the conversation — sent to Ollama as-is
+        self._history: list[dict] = [{"role": "system", "content": ""}]
+        # Parallel to _history, so trimming never has to look inside the dicts
+        self._roles: list[str] = ["system"]
+        self._has_tool_calls: list[bool] = [False]
         self._active_model: str = ""
         self._client: Optional[httpx.AsyncClient] = None
+        self._installed: Optional[set[str]] = None  # Ollama model names, from /api/tags
+        self._chat_url = f"{settings.ollama_url}/api/chat"
 
     @property
     def active_model(self) -> str:
         return self._active_model
 
+    @property
+    def messages(self) -> list[dict]:
+        """Conversation history, without the system prompt (a copy)."""
+        return self._history[1:]
+
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
             self._client = httpx.AsyncClient(timeout=settings.ollama_timeout)
@@ -77,30 +137,37 @@ class Orchestrator:
         if self._client:
             await self._client.aclose()
             self._client = None
+        await close_tools()
 
     # ── Model management ──────────────────────────────────────
 
-    async def ensure_model(self) -> str:
-        """Check if preferred model is available, fall back if needed.
-        Returns the active model name.
+    async def _installed_models(self, refresh: bool = False) -> set[str]:
+        """Installed model names, fetched from /api/tags once and then cached.
+
+        pull_model() adds to the cache, so re-checking after a pull is free.
         """
+        if self._installed is not None and not refresh:
+            return self._installed
         client = await self._get_client()
         try:
             resp = await client.get(f"{settings.ollama_url}/api/tags")
             resp.raise_for_status()
             installed = {m["name"] for m in resp.json().get("models", [])}
-            # Normalize: "qwen3:8b" might be reported as "qwen3:8b" or with :latest
-            installed_normalized = set()
-            for name in installed:
-                installed_normalized.add(name)
-                if name.endswith(":latest"):
-                    installed_normalized.add(name[:-7])
         except Exception as e:
             log.error("Cannot reach Ollama at %s: %s", settings.ollama_url, e)
             raise ConnectionError(
                 f"Cannot reach Ollama at {settings.ollama_url}. "
                 f"Is Ollama running? Start it with: ollama serve"
             ) from e
+        # Normalize: "qwen3:8b" might be reported as "qwen3:8b" or with :latest
+        self._installed = installed | {n[:-7] for n in installed if n.endswith(":latest")}
+        return self._installed
+
+    async def ensure_model(self, refresh: bool = False) -> str:
+        """Check if preferred model is available, fall back if needed.
+        Returns the active model name.
+        """
+        installed_normalized = await self._installed_models(refresh)
 
         # Check preferred model
         if settings.ollama_model in installed_normalized:
@@ -130,17 +197,20 @@ class Orchestrator:
                     if not line.strip():
                         continue
                     try:
-                        yield json.loads(line)
-                    except json.JSONDecodeError:
+                        progress = orjson.loads(line)
+                    except orjson.JSONDecodeError:
                         continue
+                    if progress.get("status") == "success" and self._installed is not None:
+                        self._installed.add(model_name)
+                    yield progress
 
     # ── System prompt ─────────────────────────────────────────
 
     def _build_system_prompt(self) -> str:
         now = datetime.now()
-        return _SYSTEM_TEMPLATE.format(
-            date=now.strftime("%A, %B %d, %Y"),
-            time=now.strftime("%I:%M %p"),
+        return _format_system_prompt(
+            now.strftime("%A, %B %d, %Y"),
+            now.strftime("%I:%M %p"),
         )
 
     # ── Ollama API ────────────────────────────────────────────
@@ -153,7 +223,7 @@ class Orchestrator:
         body: dict[str, Any] = {
             "model": self._active_model,
             "messages": messages,
-            "stream": False,
+            "stream": True,
         }
         if tools:
             body["tools"] = tools
@@ -163,15 +233,44 @@ class Orchestrator:
         log.debug("Ollama request: model=%s, %d messages, %d tools",
                    self._active_model, len(messages), len(tools or []))
 
-        resp = await client.post(f"{settings.ollama_url}/api/chat", json=body)
-        resp.raise_for_status()
-        return resp.json()["message"]
+        # Streamed, so chunks are parsed while the model is still generating
+        # rather than buffering the whole reply. orjson: the body carries the
+        # whole history plus tool schemas every round-trip.
+        content: list[str] = []
+        tool_calls: list[dict] = []
+        async with client.stream(
+            "POST",
+            self._chat_url,
+            content=orjson.dumps(body),
+            headers={"Content-Type": "application/json"},
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = orjson.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                msg = chunk.get("message") or {}
+                if msg.get("content"):
+                    content.append(msg["content"])
+                if msg.get("tool_calls"):
+                    tool_calls.extend(msg["tool_calls"])
+                if chunk.get("done"):
+                    break
+
+        message: dict[str, Any] = {"role": "assistant", "content": "".join(content)}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return message
 
     # ── Content cleanup ───────────────────────────────────────
 
     @staticmethod
     def _strip_thinking(text: str) -> str:
         """Remove <think>...</think> blocks that Qwen 3 sometimes emits."""
+        if "<think>" not in text:
+            return text.strip()  # Most replies: skip the regex engine entirely
         return _THINK_RE.sub("", text).strip()
 
     # ── Text-based tool call parsing (fallback) ────────────────
@@ -186,20 +285,14 @@ class Orchestrator:
         those and converts them into the standard format.
         """
         results = []
-        for match in _TEXT_TOOL_RE.finditer(text):
-            raw_name = match.group(1).lower()
-            raw_args = match.group(2)
+        for raw_name, args in _scan_text_tool_calls(text):
+            raw_name = raw_name.lower()
 
             # Resolve alias to registry name
             tool_name = _TOOL_ALIASES.get(raw_name)
             if not tool_name:
                 continue
 
-            try:
-                args = json.loads(raw_args)
-            except json.JSONDecodeError:
-                continue
-
             results.append({
                 "function": {"name": tool_name, "arguments": args}
             })
@@ -209,6 +302,12 @@ class Orchestrator:
 
     # ── History management ────────────────────────────────────
 
+    def _append_message(self, msg: dict) -> None:
+        """Append to the history, keeping the trim arrays in step."""
+        self._history.append(msg)
+        self._roles.append(msg["role"])
+        self._has_tool_calls.append(bool(msg.get("tool_calls")))
+
     def _trim_history(self) -> None:
         """Trim message history to max_history_messages, preserving tool groups.
 
@@ -217,22 +316,26 @@ class Orchestrator:
         conversation becomes incoherent to the model.
         """
         limit = settings.max_history_messages
-        if len(self.messages) <= limit:
+        roles = self._roles  # roles[0] is the system prompt
+        if len(roles) - 1 <= limit:
             return
+        has_tool_calls = self._has_tool_calls
 
         # Walk backwards to find a safe cut point that doesn't split a tool group
-        cut = len(self.messages) - limit
+        cut = len(roles) - limit
         # Don't cut in the middle of a tool group — advance cut past any tool messages
-        while cut < len(self.messages) and self.messages[cut].get("role") == "tool":
+        while cut < len(roles) and roles[cut] == "tool":
             cut += 1
         # If the message right before cut is an assistant with tool_calls, include it
-        if cut > 0 and self.messages[cut - 1].get("tool_calls"):
+        if cut > 1 and has_tool_calls[cut - 1]:
             cut -= 1
             # Also skip its tool results
-            while cut > 0 and self.messages[cut - 1].get("role") == "tool":
+            while cut > 1 and roles[cut - 1] == "tool":
                 cut -= 1
 
-        self.messages = self.messages[cut:]
+        del self._history[1:cut]
+        del roles[1:cut]
+        del has_tool_calls[1:cut]
 
     # ── Main chat method ──────────────────────────────────────
 
@@ -250,19 +353,20 @@ class Orchestrator:
         Returns:
             The assistant's final text response.
         """
-        self.messages.append({"role": "user", "content": user_input})
+        history = self._history
+        self._append_message({"role": "user", "content": user_input})
         self._trim_history()
+        history[0]["content"] = self._build_system_prompt()
 
-        system_prompt = self._build_system_prompt()
-        all_messages = [{"role": "system", "content": system_prompt}] + self.messages
         tool_schemas = get_all_schemas()
 
-        for iteration in range(settings.max_tool_calls_per_turn):
+        max_calls = settings.max_tool_calls_per_turn
+        for iteration in range(max_calls):
             # On last iteration, omit tools to force a text response
-            is_last = iteration == settings.max_tool_calls_per_turn - 1
+            is_last = iteration == max_calls - 1
             tools_for_call = None if is_last else tool_schemas
 
-            response = await self._call_ollama(all_messages, tools=tools_for_call)
+            response = await self._call_ollama(history, tools=tools_for_call)
 
             text = self._strip_thinking(response.get("content", ""))
             tool_calls = response.get("tool_calls", [])
@@ -280,7 +384,7 @@ class Orchestrator:
             if not tool_calls:
                 # Model gave a text response — we're done
                 if text:
-                    self.messages.append({"role": "assistant", "content": text})
+                    self._append_message({"role": "assistant", "content": text})
                 return text
 
             # Model wants to call tools — execute each one
@@ -288,8 +392,7 @@ class Orchestrator:
             assistant_msg = {"role": "assistant", "content": text}
             if tool_calls:
                 assistant_msg["tool_calls"] = tool_calls
-            self.messages.append(assistant_msg)
-            all_messages.append(assistant_msg)
+            self._append_message(assistant_msg)
 
             for tc in tool_calls:
                 fn = tc.get("function", {})
@@ -302,12 +405,13 @@ class Orchestrator:
                 result = await dispatch_tool_call(tool_name, tool_args)
 
                 tool_msg = {"role": "tool", "content": result}
-                self.messages.append(tool_msg)
-                all_messages.append(tool_msg)
+                self._append_message(tool_msg)
 
         # Shouldn't reach here, but safety net
         return text if text else "I wasn't able to complete that request."
 
     def clear_history(self) -> None:
         """Reset conversation history."""
-        self.messages.clear()
+        del self._history[1:]
+        del self._roles[1:]
+        del self._has_tool_calls[1:]
@@ -7,10 +7,11 @@ can self-correct or inform the user gracefully.
 
 from __future__ import annotations
 
-import json
 import logging
 
-from .tools import get_tool
+import orjson
+
+from .tools import TOOL_REGISTRY, get_tool
 
 log = logging.getLogger("tool_router")
 
@@ -28,8 +29,8 @@ async def dispatch_tool_call(name: str, args: dict | str) -> str:
     # Parse args if they arrive as a JSON string
     if isinstance(args, str):
         try:
-            args = json.loads(args)
-        except json.JSONDecodeError:
+            args = orjson.loads(args)
+        except orjson.JSONDecodeError:
             return f"Error: invalid JSON arguments for tool '{name}': {args[:200]}"
 
     if not isinstance(args, dict):
@@ -37,16 +38,15 @@ async def dispatch_tool_call(name: str, args: dict | str) -> str:
 
     tool = get_tool(name)
     if tool is None:
-        available = ", ".join(t.name for t in __import__(
-            "voice_assistant.tools", fromlist=["TOOL_REGISTRY"]
-        ).TOOL_REGISTRY.values())
+        available = ", ".join(TOOL_REGISTRY)
         return f"Error: unknown tool '{name}'. Available tools: {available}"
 
-    # Validate input via Pydantic model if the tool defines one
-    if tool.input_model is not None:
+    # Validate input via Pydantic model if the tool defines one. The
+    # validator is compiled once at registration; calling it directly
+    # skips BaseModel.__init__'s kwargs round-trip.
+    if tool.validator is not None:
         try:
-            validated = tool.input_model(**args)
-            args = validated.model_dump()
+            args = tool.validator.validate_python(args).model_dump()
         except Exception as e:
             return f"Error: invalid arguments for '{name}': {e}"
 
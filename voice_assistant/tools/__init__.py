@@ -14,17 +14,27 @@ if TYPE_CHECKING:
 # Global registry: tool_name -> BaseTool instance
 TOOL_REGISTRY: dict[str, BaseTool] = {}
 
+# OpenAI-format definitions, built once per tool at registration
+_ALL_SCHEMAS: list[dict] = []
+
 
 def register_tool(cls):
     """Class decorator that instantiates a BaseTool subclass and registers it."""
     instance = cls()
+    model = instance.input_model
+    if model is not None:
+        instance.validator = model.__pydantic_validator__
     TOOL_REGISTRY[instance.name] = instance
+    _ALL_SCHEMAS[:] = [tool.to_openai_schema() for tool in TOOL_REGISTRY.values()]
     return cls
 
 
 def get_all_schemas() -> list[dict]:
-    """Return OpenAI-format tool definitions for all registered tools."""
-    return [tool.to_openai_schema() for tool in TOOL_REGISTRY.values()]
+    """Return OpenAI-format tool definitions for all registered tools.
+
+    The same list is returned every call — treat it as read-only.
+    """
+    return _ALL_SCHEMAS
 
 
 def get_tool(name: str):
@@ -32,6 +42,12 @@ def get_tool(name: str):
     return TOOL_REGISTRY.get(name)
 
 
+async def close_all() -> None:
+    """Close every registered tool (call on shutdown)."""
+    for tool in TOOL_REGISTRY.values():
+        await tool.close()
+
+
 # ── Explicit registration ─────────────────────────────────────
 # Import each tool module so the @register_tool decorator fires.
 
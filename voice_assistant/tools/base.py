@@ -14,6 +14,9 @@ from pydantic import BaseModel
 class BaseTool(ABC):
     """Abstract base for a callable tool."""
 
+    # input_model's compiled pydantic-core validator, filled in by register_tool
+    validator: Any = None
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -43,6 +46,9 @@ class BaseTool(ABC):
     async def execute(self, **kwargs: Any) -> str:
         """Run the tool. Always returns a string for the tool role message."""
 
+    async def close(self) -> None:
+        """Release anything the tool holds open (HTTP clients etc.)."""
+
     def to_openai_schema(self) -> dict:
         """Generate Ollama-compatible tool definition (OpenAI function format)."""
         return {
@@ -4,12 +4,17 @@ Proves multi-tool routing works. Returns hardcoded events
 so the model can demonstrate calendar-aware responses.
 """
 
-from datetime import datetime
+from datetime import date
 from typing import Any
 
 from .base import BaseTool
 
 
+def _today_iso() -> str:
+    """Today as YYYY-MM-DD (isoformat skips strftime's format parsing)."""
+    return date.today().isoformat()
+
+
 class CalendarTool(BaseTool):
     @property
     def name(self) -> str:
@@ -33,9 +38,9 @@ class CalendarTool(BaseTool):
         }
 
     async def execute(self, **kwargs: Any) -> str:
-        date = kwargs.get("date", datetime.now().strftime("%Y-%m-%d"))
+        day = kwargs.get("date") or _today_iso()
         return (
-            f"Calendar for {date}:\n"
+            f"Calendar for {day}:\n"
             f"- 9:00 AM: Team standup (Zoom)\n"
             f"- 11:30 AM: Lunch with Alex at Torchy's Tacos\n"
             f"- 2:00 PM: Dentist appointment\n"
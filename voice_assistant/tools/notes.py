@@ -8,6 +8,17 @@ from typing import Any
 
 from .base import BaseTool
 
+# Fake notes database
+_NOTES = {
+    "shopping": "Shopping list (Feb 15):\n- Oat milk\n- Avocados\n- Sourdough bread\n- Dark chocolate\n- Olive oil",
+    "recipe": "Pasta recipe:\n1. Boil water, cook spaghetti 8 min\n2. Sauté garlic in olive oil\n3. Add crushed tomatoes, basil, salt\n4. Toss pasta, top with parmesan",
+    "ideas": "Project ideas:\n- Build a voice assistant with tool calling\n- Automate home lighting with HomeKit\n- Learn Rust by building a CLI tool",
+}
+
+# (searchable text, note) pairs, lowercased once. Key and content are
+# joined with "\0" so a query can't match across the seam.
+_SEARCH_INDEX = [(f"{key}\0{content.lower()}", content) for key, content in _NOTES.items()]
+
 
 class NotesTool(BaseTool):
     @property
@@ -33,18 +44,10 @@ class NotesTool(BaseTool):
 
     async def execute(self, **kwargs: Any) -> str:
         query = kwargs.get("query", "")
-        # Fake notes database
-        notes = {
-            "shopping": "Shopping list (Feb 15):\n- Oat milk\n- Avocados\n- Sourdough bread\n- Dark chocolate\n- Olive oil",
-            "recipe": "Pasta recipe:\n1. Boil water, cook spaghetti 8 min\n2. Sauté garlic in olive oil\n3. Add crushed tomatoes, basil, salt\n4. Toss pasta, top with parmesan",
-            "ideas": "Project ideas:\n- Build a voice assistant with tool calling\n- Automate home lighting with HomeKit\n- Learn Rust by building a CLI tool",
-        }
 
         # Simple keyword matching
-        matches = []
-        for key, content in notes.items():
-            if query.lower() in key or query.lower() in content.lower():
-                matches.append(content)
+        needle = query.lower()
+        matches = [content for haystack, content in _SEARCH_INDEX if needle in haystack]
 
         if matches:
             return f"Notes matching '{query}':\n\n" + "\n\n".join(matches)
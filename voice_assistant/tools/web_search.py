@@ -8,8 +8,12 @@ message that the model treats as authoritative state.
 from __future__ import annotations
 
 import asyncio
+import html
 import logging
 import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import httpx
@@ -19,22 +23,29 @@ from .base import BaseTool
 
 # Strip HTML tags from search snippets
 _HTML_TAG_RE = re.compile(r"<[^>]+>")
-_HTML_ENTITY_RE = re.compile(r"&#x[0-9a-fA-F]+;|&[a-z]+;")
 
 log = logging.getLogger("tools.web_search")
 
 MAX_RESULTS = 5
 SNIPPET_MAX_LEN = 500
+SEARCH_CACHE_SIZE = 128  # Distinct queries kept (LRU)
+DDG_WORKERS = 4  # Blocking DDGS calls get their own threads, off the loop's default executor
 
 
 def _clean_html(text: str) -> str:
-    """Remove HTML tags and decode common entities."""
-    text = _HTML_TAG_RE.sub("", text)
-    text = _HTML_ENTITY_RE.sub("", text)
-    return text.strip()
+    """Remove HTML tags and decode entities (&amp;, &#39;, &#x27; ...)."""
+    if "<" in text:
+        text = _HTML_TAG_RE.sub("", text)
+    return html.unescape(text).strip()
 
 
 class WebSearchTool(BaseTool):
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None  # Shared by Tavily and Brave
+        self._ddg_executor: ThreadPoolExecutor | None = None
+        self._cache: OrderedDict[str, tuple[float, str]] = OrderedDict()  # query -> (expires_at, result)
+        self._inflight: dict[str, asyncio.Future] = {}  # query -> search in progress
+
     @property
     def name(self) -> str:
         return "web_search"
@@ -64,39 +75,115 @@ class WebSearchTool(BaseTool):
         if not query:
             return "Error: no search query provided."
 
-        # Fallback chain: Tavily -> Brave -> DuckDuckGo
-        result = None
-        if settings.tavily_api_key:
-            result = await self._search_tavily(query)
-        if result is None and settings.brave_api_key:
-            result = await self._search_brave(query)
-        if result is None:
-            result = await self._search_duckduckgo(query)
+        key = " ".join(query.lower().split())
+        cached = self._cache_get(key)
+        if cached is not None:
+            log.info("Search cache hit for '%s'", query[:60])
+            return cached
+
+        # Single-flight: an identical query already in progress is awaited, not repeated
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._search(key, query))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded, so one caller giving up doesn't cancel the search for the others
+        result = await asyncio.shield(task)
 
         if result is None:
             return f"Web search failed for '{query}'. All search providers returned no results."
 
         return result
 
+    async def _search(self, key: str, query: str) -> str | None:
+        """Run the provider race for query and cache a non-None result under key."""
+        # Preference order: Tavily -> Brave -> DuckDuckGo
+        providers = []
+        if settings.tavily_api_key:
+            providers.append(self._search_tavily)
+        if settings.brave_api_key:
+            providers.append(self._search_brave)
+        providers.append(self._search_duckduckgo)
+
+        result = await self._race(providers, query)
+        if result is not None:
+            self._cache_put(key, result)
+        return result
+
+    def _cache_get(self, key: str) -> str | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[key]  # Stale — weather and news go out of date
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key: str, result: str) -> None:
+        self._cache[key] = (time.monotonic() + settings.search_cache_ttl, result)
+        self._cache.move_to_end(key)
+        if len(self._cache) > SEARCH_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    async def _race(self, providers: list, query: str) -> str | None:
+        """Hedged search: the first provider runs alone for search_hedge_delay,
+        then the rest join it and the first non-None result wins.
+
+        A fast preferred provider answers on its own; a slow or failing one
+        costs min() rather than sum() of the providers' latencies.
+        """
+        pending = {asyncio.ensure_future(providers[0](query))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=settings.search_hedge_delay)
+            for task in done:
+                if task.result() is not None:
+                    return task.result()
+            pending |= {asyncio.ensure_future(p(query)) for p in providers[1:]}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result() is not None:
+                        return task.result()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # One long-lived client keeps connections alive between searches,
+        # so only the first query to each provider pays for TCP + TLS setup
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=settings.search_timeout)
+        return self._client
+
+    async def close(self) -> None:
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+        if self._ddg_executor:
+            self._ddg_executor.shutdown(wait=False, cancel_futures=True)
+            self._ddg_executor = None
+
     # ── Tavily ────────────────────────────────────────────────
 
     async def _search_tavily(self, query: str) -> str | None:
         try:
-            async with httpx.AsyncClient(timeout=settings.search_timeout) as client:
-                resp = await client.post(
-                    "https://api.tavily.com/search",
-                    json={
-                        "query": query,
-                        "max_results": MAX_RESULTS,
-                        "include_answer": True,
-                    },
-                    headers={
-                        "X-API-Key": settings.tavily_api_key,
-                        "Content-Type": "application/json",
-                    },
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            client = await self._get_client()
+            resp = await client.post(
+                "https://api.tavily.com/search",
+                json={
+                    "query": query,
+                    "max_results": MAX_RESULTS,
+                    "include_answer": True,
+                },
+                headers={
+                    "X-API-Key": settings.tavily_api_key,
+                    "Content-Type": "application/json",
+                },
+            )
+            resp.raise_for_status()
+            data = resp.json()
 
             lines = [f"Web search results for '{query}':"]
 
@@ -128,17 +215,17 @@ class WebSearchTool(BaseTool):
 
     async def _search_brave(self, query: str) -> str | None:
         try:
-            async with httpx.AsyncClient(timeout=settings.search_timeout) as client:
-                resp = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": MAX_RESULTS},
-                    headers={
-                        "X-Subscription-Token": settings.brave_api_key,
-                        "Accept": "application/json",
-                    },
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            client = await self._get_client()
+            resp = await client.get(
+                "https://api.search.brave.com/res/v1/web/search",
+                params={"q": query, "count": MAX_RESULTS},
+                headers={
+                    "X-Subscription-Token": settings.brave_api_key,
+                    "Accept": "application/json",
+                },
+            )
+            resp.raise_for_status()
+            data = resp.json()
 
             lines = [f"Web search results for '{query}':"]
 
@@ -186,7 +273,9 @@ class WebSearchTool(BaseTool):
                 log.warning("DuckDuckGo search failed: %s", e)
                 return []
 
-        raw = await asyncio.get_event_loop().run_in_executor(None, _sync)
+        if self._ddg_executor is None:
+            self._ddg_executor = ThreadPoolExecutor(max_workers=DDG_WORKERS, thread_name_prefix="ddg")
+        raw = await asyncio.get_running_loop().run_in_executor(self._ddg_executor, _sync)
         if not raw:
             return None
 
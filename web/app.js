@@ -143,6 +143,23 @@ function populateModelSelect(catalog, defaultProvider, defaultModel) {
     currentSelectValue = providerSelect.value;
 }
 
+// Rebuild the model select after a pull; auto-select the downloaded model
+function applyModelCatalogUpdate(catalog) {
+    const prevValue = currentSelectValue;
+    populateModelSelect(catalog, "ollama", "");
+    // Auto-select the just-downloaded model if we know which one it was
+    if (pendingDownloadModel) {
+        const autoVal = "ollama:" + pendingDownloadModel;
+        providerSelect.value = autoVal;
+        currentSelectValue = autoVal;
+        sendMsg("set_model", { provider: "ollama", model: pendingDownloadModel });
+        pendingDownloadModel = "";
+    } else {
+        providerSelect.value = prevValue;
+        currentSelectValue = prevValue;
+    }
+}
+
 // --- Download progress ---
 function showDownloadProgress(model, percent, status) {
     downloadBar.classList.remove("hidden");
@@ -329,6 +346,8 @@ function handleMessage(msg) {
         case "pull_complete":
             showDownloadProgress(msg.model, 100, "complete!");
             setTimeout(hideDownloadProgress, 1500);
+            // Refreshed catalog rides along on the same frame
+            if (msg.model_catalog) applyModelCatalogUpdate(msg.model_catalog);
             break;
 
         case "pull_error":
@@ -337,21 +356,7 @@ function handleMessage(msg) {
             break;
 
         case "model_catalog_update":
-            if (msg.model_catalog) {
-                const prevValue = currentSelectValue;
-                populateModelSelect(msg.model_catalog, "ollama", "");
-                // Auto-select the just-downloaded model if we know which one it was
-                if (pendingDownloadModel) {
-                    const autoVal = "ollama:" + pendingDownloadModel;
-                    providerSelect.value = autoVal;
-                    currentSelectValue = autoVal;
-                    sendMsg("set_model", { provider: "ollama", model: pendingDownloadModel });
-                    pendingDownloadModel = "";
-                } else {
-                    providerSelect.value = prevValue;
-                    currentSelectValue = prevValue;
-                }
-            }
+            if (msg.model_catalog) applyModelCatalogUpdate(msg.model_catalog);
             break;
 
         case "model_set":